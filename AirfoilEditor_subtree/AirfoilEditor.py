@@ -35,6 +35,7 @@ sys.path.append(os.path.join(Path(__file__).parent , 'modules'))
 from model.airfoil          import Airfoil, usedAs, GEO_SPLINE
 from model.airfoil_geometry import Panelling_Spline, Panelling_Bezier
 from model.airfoil_examples import Example
+from model.airfoil_library  import Airfoil_Library
 
 from base.common_utils      import * 
 from base.panels            import Container_Panel, MessageBox
@@ -123,6 +124,12 @@ class App_Main (QMainWindow):
         maximize = Settings().get('window_maximize', False)
         Win_Util.set_initialWindowSize (self, size_frac= (0.80, 0.70), pos_frac=(0.1, 0.1),
                                         geometry=geometry, maximize=maximize)
+
+        # optional airfoil library index for airfoil selection 
+
+        airfoil_library = Settings().get('airfoil_library', None)
+        if airfoil_library: 
+            Airfoil_Library.set_default (airfoil_library)
         
         self._load_panelling_settings ()
 
@@ -806,9 +806,7 @@ class Matcher (QThread):
             reduced_target = target_line 
 
         # evaluate the new y values on Bezier for the target x-coordinate   
-        y_new = np.zeros (len(reduced_target.y))
-        for i, x in enumerate(reduced_target.x) :
-            y_new[i] = bezier.eval_y_on_x (x, fast=False, epsilon=1e-7)
+        y_new = bezier.eval_y_on_x (reduced_target.x, fast=False, epsilon=1e-7)
 
         # calculate abs difference between bezier y and target y
         devi = np.abs((y_new - reduced_target.y))
@@ -17,6 +17,7 @@ sys.path.append('./modules')
 
 from model.airfoil          import Airfoil, Airfoil_Bezier, GEO_BASIC, GEO_SPLINE
 from model.airfoil_examples import Root_Example, Tip_Example
+from model.airfoil_library  import Airfoil_Library
 from model.airfoil_geometry import Geometry, Geometry_Splined, Geometry_Bezier
 from model.airfoil_geometry import Curvature_of_xy, Curvature_of_Spline, Curvature_of_Bezier
 
@@ -131,6 +132,17 @@ class Test_Airfoil:
         assert round(curv.lower._get_maximum()[1],0) == 372
         assert round(np.min (np.abs(curv.lower.y[-10:])),3) == 0.032
 
+        # y on new x - the knots of the sides must be reproduced 
+
+        airfoil = Root_Example(geometry = GEO_SPLINE)
+        geo : Geometry_Splined = airfoil.geo
+        geo.normalize()
+
+        upper = geo.upper_new_x (geo.upper.x)
+        lower = geo.lower_new_x (geo.lower.x)
+        assert np.max (np.abs (upper.y - geo.upper.y)) < 1e-8
+        assert np.max (np.abs (lower.y - geo.lower.y)) < 1e-8
+
 
 
     def test_airfoil_geo_functions (self):
@@ -245,6 +257,81 @@ class Test_Airfoil:
         shutil.rmtree(str(p_tmp))
 
 
+    def test_airfoil_load_lines (self):
+
+        # fast parser must be equal to the tolerant line parser 
+
+        import glob
+        from pathlib import Path
+
+        airfoil = Airfoil (name='parser')
+
+        pathFileNames = glob.glob (str (Path(__file__).parent.parent / 'test_airfoils' / '*.dat'))
+        assert len (pathFileNames) > 10
+
+        for pathFileName in pathFileNames:
+            with open(pathFileName, 'r') as f:
+                file_lines = f.readlines()
+
+            name, x, y = airfoil._loadLines (file_lines)
+            name_t, x_t, y_t = airfoil._loadLines_tolerant (file_lines)
+            assert name == name_t
+            assert np.array_equal (x, x_t) and np.array_equal (y, y_t)
+
+        # duplicates are removed 
+
+        file_lines = ["dup\n", "1.0 0.0\n", "0.5 0.1\n", "0.5 0.1\n", "0.0 0.0\n", "0.5 -0.1\n", "1.0 0.0\n"]
+        name, x, y = airfoil._loadLines (file_lines)
+        assert name == "dup"
+        assert len(x) == 5 and np.array_equal (x, [1.0, 0.5, 0.0, 0.5, 1.0])
+
+        # lines the fast parser can't handle are parsed by the tolerant parser 
+
+        file_lines = ["tolerant\n", "1.0 0.0\n", "0.5\n", "\n", "0.0 0.0 7\n"]
+        name, x, y = airfoil._loadLines (file_lines)
+        assert np.array_equal (x, [1.0, 0.0]) and np.array_equal (y, [0.0, 0.0])
+
+
+    def test_airfoil_file_cache (self, tmp_path):
+
+        # binary file cache must return the parsed coordinates - stale entries are removed
+
+        import shutil
+        from pathlib import Path
+
+        pathFileName = str (tmp_path / 'MH32.dat')
+        shutil.copy (Path(__file__).parent.parent / 'test_airfoils' / 'MH32.dat', pathFileName)
+
+        Airfoil.set_file_cache (str (tmp_path / 'cache'))
+        cache = Airfoil.file_cache
+
+        try:
+            parsed = Airfoil (pathFileName=pathFileName)
+            parsed.load()
+            assert cache.misses == 1
+
+            cached = Airfoil (pathFileName=pathFileName)
+            cached.load()
+            assert cache.hits == 1
+            assert cached.name == parsed.name
+            assert np.array_equal (cached.x, parsed.x) and np.array_equal (cached.y, parsed.y)
+
+            # touched file with same content is still valid
+            os.utime (pathFileName, ns=(0, 0))
+            Airfoil (pathFileName=pathFileName).load()
+            assert cache.hits == 2 and cache.evicted == 0
+
+            # modified file
+            with open(pathFileName, 'a') as f:
+                f.write ("0.5 0.5\n")
+            modified = Airfoil (pathFileName=pathFileName)
+            modified.load()
+            assert cache.evicted == 1
+            assert len (modified.x) == len (parsed.x) + 1
+        finally:
+            Airfoil.set_file_cache (None)
+
+
 
 class Test_Airfoil_Bezier:
 
@@ -320,6 +407,66 @@ class Test_Airfoil_Bezier:
     
 
 
+
+class Test_Airfoil_Library:
+
+    def test_library (self, tmp_path):
+
+        # scan is incremental, queries answer from the index without loading 
+
+        import shutil
+        from pathlib import Path
+
+        test_dir = Path(__file__).parent.parent / 'test_airfoils'
+        for fileName in ['MH32.dat', 'clarky.dat', 'JX-GP-100.dat']:
+            shutil.copy (test_dir / fileName, tmp_path / fileName)
+        (tmp_path / 'not_an_airfoil.dat').write_text ("nothing\n")
+
+        indexFile = str (tmp_path / 'library.npz')
+        library = Airfoil_Library (indexFile)
+        assert library.scan (str(tmp_path)) == (4, 0, 0)
+        library.save ()
+
+        # metrics are those of the basic geometry 
+        clarky = Airfoil (pathFileName=str (tmp_path / 'clarky.dat'), geometry=GEO_BASIC)
+        clarky.load()
+        clarky.normalize (just_basic=True)
+        metrics = library.metrics_of (str (tmp_path / 'clarky.dat'))
+        assert metrics ['max_thick'] == clarky.geo.max_thick
+        assert metrics ['max_camb_x'] == clarky.geo.max_camb_x
+        assert metrics ['nPanels'] == clarky.geo.nPanels
+
+        # persistent and incremental 
+        library = Airfoil_Library (indexFile)
+        assert len (library) == 4
+        os.remove (tmp_path / 'MH32.dat')
+        assert library.scan (str(tmp_path)) == (0, 3, 1)
+
+        # queries 
+        t = metrics ['max_thick']
+        found = library.filter (max_thick=(t - 0.005, t + 0.005))
+        assert found == [os.path.normpath (tmp_path / 'clarky.dat')]
+        assert library.filter (max_thick=(None, 0.0)) == []
+
+        nearest = library.nearest (max_thick=0.1, max_camb=0.03, n=5)
+        assert len (nearest) == 2                               # not_an_airfoil is never found
+        assert nearest[0][0] == found[0]
+
+        with pytest.raises (ValueError):
+            library.filter (thickness=(0.1, 0.2))
+
+        # nearest to an airfoil excludes the airfoil itself 
+        nearest = library.nearest_to (clarky, n=5)
+        assert [p for p, _ in nearest] == [os.path.normpath (tmp_path / 'JX-GP-100.dat')]
+
+        # rescan of the scanned directories - also after reload 
+        library.save ()
+        library = Airfoil_Library (indexFile)
+        assert library.directories == [os.path.normpath (tmp_path)]
+        shutil.copy (test_dir / 'MH32.dat', tmp_path / 'MH32.dat')
+        assert library.rescan () == (1, 3, 0)
+
+
 # Main program for testing 
 if __name__ == "__main__":
 
@@ -328,6 +475,7 @@ if __name__ == "__main__":
     test.test_geo_splined()
     test.test_airfoil_geo_functions ()
     test.test_airfoil_file_functions ()
+    test.test_airfoil_load_lines ()
 
     test = Test_Airfoil_Bezier()
     test.test_geo_bezier ()
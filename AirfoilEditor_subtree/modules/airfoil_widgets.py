@@ -19,9 +19,11 @@ from PyQt6.QtWidgets        import QHBoxLayout, QLayout
 from PyQt6.QtWidgets        import QFileDialog, QWidget
 
 from base.widgets           import * 
+from base.panels            import Dialog 
 
 from model.airfoil          import Airfoil, Airfoil_Bezier, Airfoil_Hicks_Henne
 from model.airfoil          import GEO_BASIC, usedAs
+from model.airfoil_library  import Airfoil_Library
 
 
 # ----- common methods -----------
@@ -145,6 +147,7 @@ class Airfoil_Select_Open_Widget (Widget, QWidget):
     Compound widget to either select or open new airfoil 
         - ComboBox (optional with spin) with files in same directory
         - optional Open button to select new airfoil 
+        - optional Find button to fill the ComboBox with airfoils of the airfoil library
         - optional Delete button to delete current   
 
     When user successfully selected an airfoil file, 'set' is called with 
@@ -163,6 +166,7 @@ class Airfoil_Select_Open_Widget (Widget, QWidget):
                  withOpen = True,           # include open button 
                  textOpen = "Open",         # text for Open button 
                  widthOpen = 100,           # width of open text button 
+                 withFind = True,           # include find button if there is an airfoil library 
                  initialDir : Airfoil | str | None = None, # either an airfoil or a pathString 
                  **kwargs):
         super().__init__(*args, get=get, set=set, **kwargs)
@@ -171,6 +175,7 @@ class Airfoil_Select_Open_Widget (Widget, QWidget):
         self._no_files_here = None
         self._initial_dir = initialDir
         self._addEmpty = addEmpty is True 
+        self._found_pathFileNames = None            # airfoils found in library - instead of same dir
 
         # get initial properties  (cur airfoil) 
         self._get_properties ()
@@ -191,12 +196,17 @@ class Airfoil_Select_Open_Widget (Widget, QWidget):
                                                 hide=self.no_files_here, signal=False)
         if withOpen:
             # either text button if nothing is there
-            Airfoil_Open_Widget (l, text=textOpen, set=self.set_airfoil, signal=False,
+            Airfoil_Open_Widget (l, text=textOpen, set=self._open_airfoil, signal=False,
                                  width = widthOpen,
                                  hide=lambda: not self.no_files_here())
             # ... or icon button together with combo box 
-            Airfoil_Open_Widget (l, asIcon=True, set=self.set_airfoil, signal=False,
+            Airfoil_Open_Widget (l, asIcon=True, set=self._open_airfoil, signal=False,
                                  hide=self.no_files_here)
+        if withFind:
+            Button (l, text="Find", width=40, set=self._find,
+                    hide=lambda: Airfoil_Library.default is None,
+                    toolTip="Find airfoils in the airfoil library by thickness and camber")
+        if withOpen:
             l.insertStretch (-1)
 
         l.setContentsMargins (QMargins(0, 0, 0, 0))
@@ -217,7 +227,7 @@ class Airfoil_Select_Open_Widget (Widget, QWidget):
         self._get_properties ()
         self._set_Qwidget_static ()
         self._set_Qwidget ()
-        self._combo_widget.setToolTip (self.airfoil_fileName())  
+        self._combo_widget.setToolTip (self._combo_toolTip())  
 
         # assign self to parent layout 
 
@@ -272,7 +282,7 @@ class Airfoil_Select_Open_Widget (Widget, QWidget):
             w.refresh()
 
         # set tooltip of combobox to show full filename
-        self._combo_widget.setToolTip (self.airfoil_fileName())
+        self._combo_widget.setToolTip (self._combo_toolTip())
 
         # leave self for callback in a few ms 
         timer = QTimer()                                
@@ -282,9 +292,46 @@ class Airfoil_Select_Open_Widget (Widget, QWidget):
         pass
 
 
+    def _open_airfoil (self, anAirfoil : Airfoil):
+        """ airfoil opened with file dialog - combo will show airfoils of its directory"""
+
+        self._found_pathFileNames = None
+        self.set_airfoil (anAirfoil)
+
+
+    def _find (self):
+        """ find airfoils in the airfoil library - they will be the new options of combo"""
+
+        dialog = Airfoil_Library_Dialog (self, Airfoil_Library.default, airfoil=self.airfoil)
+
+        if dialog.exec():
+            found = dialog.pathFileNames
+
+            # keep current airfoil as first option 
+            if found is not None and self.airfoil is not None and self.airfoil.pathFileName:
+                current = os.path.normpath (os.path.abspath (os.path.join (self.airfoil.workingDir, 
+                                                                           self.airfoil.pathFileName)))
+                found = [current] + [p for p in found if p != current]
+
+            self._found_pathFileNames = found
+            self.refresh ()
+            Widget.refresh_childs (self)
+
+
     def airfoil_fileName (self) -> str | None:
         return self.airfoil.fileName if self.airfoil is not None else None
 
+    def _combo_toolTip (self) -> str | None:
+        """ filename of airfoil - with metrics if it is in the default airfoil library"""
+
+        toolTip = self.airfoil_fileName()
+        library = Airfoil_Library.default
+        if toolTip and library is not None and self.airfoil.pathFileName:
+            description = library.description_of (os.path.join (self.airfoil.workingDir, self.airfoil.pathFileName))
+            if description: 
+                toolTip = f"{toolTip}\n{description}"
+        return toolTip
+
     def set_airfoil_by_fileName (self, newFileName): 
         """ set new current airfoil bei filename""" 
 
@@ -294,12 +341,7 @@ class Airfoil_Select_Open_Widget (Widget, QWidget):
             return 
 
         # get full path of new fileName 
-        if self.airfoil is None:
-            sameDir = self._initial_dir
-        else: 
-            sameDir = self.airfoil
-
-        for aPathFileName in get_airfoil_files_sameDir (sameDir):
+        for aPathFileName in self._airfoil_pathFileNames ():
             if newFileName == os.path.basename(aPathFileName):
 
                 if os.path.isfile (aPathFileName):   # maybe it was deleted in meantime 
@@ -310,19 +352,159 @@ class Airfoil_Select_Open_Widget (Widget, QWidget):
                 break
 
 
-    def airfoil_fileNames_sameDir (self): 
-        """ list of airfoil filenames in the same dir as current airfoil"""
+    def _airfoil_pathFileNames (self) -> list[str]: 
+        """ airfoil files of combo - either found in library or in the same dir as current airfoil"""
+
+        if self._found_pathFileNames is not None:
+            return self._found_pathFileNames
 
         if self.airfoil is None:
             sameDir = self._initial_dir
         else: 
             sameDir = self.airfoil
 
+        return get_airfoil_files_sameDir (sameDir)
+
+
+    def airfoil_fileNames_sameDir (self): 
+        """ list of airfoil filenames in the same dir as current airfoil - or found in library"""
+
         fileNames = []
         if self._addEmpty: 
             fileNames.append ("")
            
-        for aFileName in get_airfoil_files_sameDir (sameDir):
+        for aFileName in self._airfoil_pathFileNames ():
             fileNames.append(os.path.basename(aFileName))
 
-        return fileNames
\ No newline at end of file
+        return fileNames
+
+
+
+class Airfoil_Library_Dialog (Dialog):
+    """ 
+    Dialog to find airfoils in the airfoil library 
+        - by ranges of thickness and camber
+        - nearest to the current airfoil 
+
+    The found airfoil files are in 'pathFileNames' - None means airfoils of directory
+    """
+
+    _width  = 440
+    _height = 330
+
+    name = "Find Airfoils in Library"
+
+    RANGE_METRICS = (('max_thick',   "Thickness"), 
+                     ('max_thick_x', "... at"), 
+                     ('max_camb',    "Camber"), 
+                     ('max_camb_x',  "... at"))
+
+    N_NEAREST = 20                                      # number of airfoils of 'nearest'
+
+
+    def __init__ (self, parent : QWidget, library : Airfoil_Library, airfoil : Airfoil | None = None): 
+
+        self._library = library
+        self._airfoil = airfoil
+        self._ranges  = {metric : [0.0, 1.0] for metric, _ in self.RANGE_METRICS}
+        self._message = ""
+
+        self.pathFileNames : list[str] | None = None
+
+        super().__init__ (parent=parent)
+
+
+    def _init_layout(self) -> QLayout:
+
+        l = QGridLayout()
+        r = 0 
+        Label  (l,r,0, colSpan=5, get=self._library_text, style=style.COMMENT)
+        r += 1
+        SpaceR (l, r, stretch=0) 
+        for metric, text in self.RANGE_METRICS:
+            r += 1
+            FieldF (l,r,0, lab=text, width=70, unit="%", dec=1, step=0.5, lim=(0, 100),
+                    get=lambda m=metric: self._ranges[m][0], set=lambda v, m=metric: self._set_range (m, 0, v))
+            FieldF (l,r,2, lab="to", width=70, unit="%", dec=1, step=0.5, lim=(0, 100),
+                    get=lambda m=metric: self._ranges[m][1], set=lambda v, m=metric: self._set_range (m, 1, v))
+        r += 1
+        SpaceR (l, r, stretch=0) 
+        r += 1
+        Button (l,r,1, text="Filter", width=70, set=self._filter,
+                toolTip="Airfoils having thickness and camber within the ranges")
+        Button (l,r,3, text="Nearest", width=70, set=self._nearest, disable=self._airfoil is None,
+                toolTip=f"The {self.N_NEAREST} airfoils closest to the current airfoil in thickness and camber")
+        r += 1
+        Button (l,r,1, text="Directory", width=70, set=self._directory,
+                toolTip="Airfoils in the directory of the current airfoil")
+        Button (l,r,3, text="Rescan", width=70, set=self._rescan,
+                toolTip="Update library with new or changed airfoil files of its directories")
+        r += 1
+        SpaceR (l, r, height=5, stretch=1) 
+        r += 1
+        Label  (l,r,0, colSpan=5, get=self._result_text, style=style.COMMENT, height=(30,None))
+        l.setColumnStretch (4,2)
+        l.setColumnMinimumWidth (0,70)
+        return l
+
+
+    def _set_range (self, metric : str, i : int, aVal : float):
+        self._ranges [metric][i] = aVal
+
+
+    def _library_text (self) -> str:
+        name = os.path.basename (self._library.indexFile) if self._library.indexFile else "-"
+        return f"Airfoil library '{name}' with {len(self._library)} airfoils"
+
+
+    def _result_text (self) -> str:
+        if self._message:
+            return self._message
+        elif self.pathFileNames is None:
+            return "Airfoils in directory of current airfoil"
+        else:
+            return f"{len(self.pathFileNames)} airfoils found"
+
+
+    def _filter (self):
+        """ airfoils within ranges"""
+
+        self.pathFileNames = self._library.filter (**{m: tuple (r) for m, r in self._ranges.items()})
+        self._message = ""
+        self.refresh ()
+
+
+    def _nearest (self):
+        """ airfoils nearest to current airfoil"""
+
+        nearest = self._library.nearest_to (self._airfoil, n=self.N_NEAREST)
+        self.pathFileNames = [pathFileName for pathFileName, _ in nearest]
+        self._message = ""
+        self.refresh ()
+
+
+    def _directory (self):
+        """ back to airfoils of directory"""
+
+        self.pathFileNames = None
+        self._message = ""
+        self.refresh ()
+
+
+    def _rescan (self):
+        """ rescan directories of library - or directory of current airfoil if library is empty"""
+
+        QApplication.setOverrideCursor (Qt.CursorShape.WaitCursor)
+        try: 
+            if not self._library.directories and self._airfoil is not None and self._airfoil.pathFileName:
+                directory = os.path.dirname (os.path.join (self._airfoil.workingDir, self._airfoil.pathFileName))
+                n_calc, n_unchanged, n_removed = self._library.scan (directory or '.', recursive=False)
+            else: 
+                n_calc, n_unchanged, n_removed = self._library.rescan ()
+            if self._library.indexFile:
+                self._library.save ()
+        finally:
+            QApplication.restoreOverrideCursor ()
+
+        self._message = f"Rescan: {n_calc} calculated, {n_unchanged} unchanged, {n_removed} removed"
+        self.refresh ()
\ No newline at end of file
@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+    Cache utility - bounded memo caches with hit/miss statistics
+
+    LRU_Cache       - dict like cache with max size and least recently used eviction
+    File_Cache      - opt-in binary sidecar cache of arrays parsed from text files 
+
+"""
+
+import os
+import struct
+import hashlib
+from collections import OrderedDict
+import weakref
+
+import numpy as np
+
+
+#------------ LRU Cache -----------------------------------
+
+
+class LRU_Cache:
+    """
+    Small dict like memo cache which is bounded in size.
+
+    If maxsize is reached, the least recently used entry is removed.
+    Hits and misses are counted to see in profiling, whether a cache earns its keep.
+    All living caches having the same name are summarized in 'statistics'
+    """
+
+    _all_caches = weakref.WeakSet()                     # all living caches for statistics
+
+    def __init__ (self, maxsize : int = 256, name : str|None = None):
+        """
+        Args:
+            maxsize: max number of entries
+            name: optional name for statistics
+        """
+
+        self._maxsize = max (1, int(maxsize))
+        self._name    = name if name else 'LRU_Cache'
+        self._dict    = OrderedDict()
+
+        self._hits    = 0
+        self._misses  = 0
+
+        LRU_Cache._all_caches.add (self)
+
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} '{self._name}' {len(self)}/{self._maxsize} hits:{self._hits} misses:{self._misses}>"
+
+    def __len__ (self) -> int:
+        return len (self._dict)
+
+    def __contains__ (self, key) -> bool:
+        """ check for key - doesn't count as hit or miss"""
+        return key in self._dict
+
+    @property
+    def name (self) -> str:
+        """ name of self for statistics"""
+        return self._name
+
+    @property
+    def maxsize (self) -> int:
+        """ max number of entries"""
+        return self._maxsize
+
+    @property
+    def hits (self) -> int:
+        """ number of successful lookups"""
+        return self._hits
+
+    @property
+    def misses (self) -> int:
+        """ number of lookups without result"""
+        return self._misses
+
+    @property
+    def hit_rate (self) -> float:
+        """ hits / lookups - 0.0 if there was no lookup"""
+        n = self._hits + self._misses
+        return self._hits / n if n else 0.0
+
+
+    def get (self, key, default=None):
+        """ returns value of key or default if key isn't in cache"""
+
+        try:
+            value = self._dict [key]
+        except KeyError:
+            self._misses += 1
+            return default
+
+        self._dict.move_to_end (key)
+        self._hits += 1
+        return value
+
+
+    def put (self, key, value):
+        """ stores value of key - removes least recently used entry if maxsize is reached"""
+
+        self._dict [key] = value
+        self._dict.move_to_end (key)
+
+        if len (self._dict) > self._maxsize:
+            self._dict.popitem (last=False)
+
+
+    def clear (self):
+        """ removes all entries - statistics remain"""
+        self._dict.clear()
+
+
+    def reset_statistics (self):
+        """ reset hit and miss counters"""
+        self._hits   = 0
+        self._misses = 0
+
+
+    @classmethod
+    def statistics (cls) -> dict[str, tuple[int, int, int]]:
+        """
+        hits, misses and number of entries of all living caches summarized by name
+
+        Returns:
+            dict with name: (hits, misses, entries)
+        """
+
+        stats = {}
+        for cache in list(cls._all_caches):
+            hits, misses, entries = stats.get (cache.name, (0, 0, 0))
+            stats [cache.name] = (hits + cache.hits, misses + cache.misses, entries + len(cache))
+        return stats
+
+
+    @classmethod
+    def print_statistics (cls):
+        """ print statistics of all living caches for profiling"""
+
+        for name, (hits, misses, entries) in sorted (cls.statistics().items()):
+            n = hits + misses
+            rate = hits / n * 100 if n else 0.0
+            print (f"{name:30} hits: {hits:8d}   misses: {misses:8d}   hit rate: {rate:5.1f}%   entries: {entries:6d}")
+
+
+
+#------------ File Cache -----------------------------------
+
+
+class File_Cache:
+    """
+    Opt-in binary sidecar cache of data parsed from (text) files like airfoil .dat files.
+
+    For each source file a small binary file is written into the cache directory holding
+    a name and float arrays parsed from the source. The entry is addressed by the absolute 
+    path of the source. 
+
+    An entry is valid if mtime and size of the source are unchanged. If only mtime changed 
+    (e.g. file copied or touched) the content hash decides. Stale entries are removed.
+
+    The format is raw little endian float64 - reading is much faster than parsing text 
+    or loading a .npz archive. 
+    """
+
+    MAGIC   = b'FCA1'
+    HEADER  = struct.Struct ('<4sqq20sII')              # magic, mtime_ns, size, sha1, len name, n arrays 
+    EXT     = '.bin'
+
+    def __init__ (self, directory : str):
+        """
+        Args:
+            directory: directory of the cache files - will be created if not existing 
+        """
+
+        self._directory = os.path.abspath (directory)
+        os.makedirs (self._directory, exist_ok=True)
+
+        self._hits    = 0
+        self._misses  = 0
+        self._evicted = 0
+
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} '{self._directory}' hits:{self._hits} misses:{self._misses} evicted:{self._evicted}>"
+
+    @property
+    def directory (self) -> str:
+        """ absolute path of the cache directory"""
+        return self._directory
+
+    @property
+    def hits (self) -> int:
+        """ number of successful lookups"""
+        return self._hits
+
+    @property
+    def misses (self) -> int:
+        """ number of lookups without result"""
+        return self._misses
+
+    @property
+    def evicted (self) -> int:
+        """ number of stale entries removed"""
+        return self._evicted
+
+
+    def _entry_path (self, pathFileName : str) -> str:
+        """ path of the cache file of a source file"""
+
+        key = hashlib.sha1 (os.path.abspath (pathFileName).encode ('utf-8')).hexdigest()
+        return os.path.join (self._directory, key + self.EXT)
+
+
+    def _remove (self, entry_path : str):
+        """ remove stale entry"""
+
+        try: 
+            os.remove (entry_path)
+            self._evicted += 1
+        except OSError:
+            pass
+
+
+    def get (self, pathFileName : str) -> tuple[str, list[np.ndarray]] | None:
+        """
+        name and arrays of source file - None if there is no valid entry
+
+        Args:
+            pathFileName: path of the source file
+        """
+
+        entry_path = self._entry_path (pathFileName)
+
+        try:
+            stat = os.stat (pathFileName)
+            with open (entry_path, 'rb') as f:
+                buffer = f.read()
+            magic, mtime_ns, size, digest, len_name, n_arrays = self.HEADER.unpack_from (buffer)
+        except (OSError, struct.error):
+            self._misses += 1
+            return None
+
+        if magic != self.MAGIC or size != stat.st_size:
+            self._remove (entry_path)
+            self._misses += 1
+            return None
+
+        if mtime_ns != stat.st_mtime_ns:
+
+            # touched or copied - check content 
+            with open (pathFileName, 'rb') as f:
+                source = f.read()
+            if hashlib.sha1 (source).digest() != digest:
+                self._remove (entry_path)
+                self._misses += 1
+                return None
+            self._write (entry_path, stat, digest, len_name, n_arrays, buffer [self.HEADER.size:])
+
+        # name, array lengths, data 
+        try: 
+            offset = self.HEADER.size
+            name   = buffer [offset : offset + len_name].decode ('utf-8')
+            offset += len_name
+            lengths = struct.unpack_from (f'<{n_arrays}I', buffer, offset)
+            offset += 4 * n_arrays
+
+            arrays = []
+            for n in lengths:
+                arrays.append (np.frombuffer (buffer, dtype='<f8', count=n, offset=offset).astype (float))
+                offset += 8 * n
+        except (ValueError, struct.error):                  # corrupt entry 
+            self._remove (entry_path)
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        return name, arrays
+
+
+    def put (self, pathFileName : str, name : str, arrays : list[np.ndarray]):
+        """
+        stores name and arrays parsed from source file 
+
+        Args:
+            pathFileName: path of the source file
+            name: name e.g. of airfoil 
+            arrays: list of 1D float arrays  
+        """
+
+        try:
+            stat = os.stat (pathFileName)
+            with open (pathFileName, 'rb') as f:
+                digest = hashlib.sha1 (f.read()).digest()
+        except OSError:
+            return 
+
+        name_bytes = name.encode ('utf-8')
+        arrays     = [np.asarray (a, dtype='<f8') for a in arrays]
+
+        body = b''.join ([name_bytes, struct.pack (f'<{len(arrays)}I', *[len(a) for a in arrays])] +
+                         [a.tobytes() for a in arrays])
+
+        self._write (self._entry_path (pathFileName), stat, digest, len(name_bytes), len(arrays), body)
+
+
+    def _write (self, entry_path, stat, digest, len_name, n_arrays, body):
+        """ atomic write of an entry - body is name, array lengths and data"""
+
+        header = self.HEADER.pack (self.MAGIC, stat.st_mtime_ns, stat.st_size, digest, len_name, n_arrays)
+
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            with open (tmp_path, 'wb') as f:
+                f.write (header + body)
+            os.replace (tmp_path, entry_path)
+        except OSError:
+            try: 
+                os.remove (tmp_path)
+            except OSError:
+                pass
+
+
+    def clear (self):
+        """ removes all entries of the cache directory - statistics remain"""
+
+        for fileName in os.listdir (self._directory):
+            if fileName.endswith (self.EXT):
+                try: 
+                    os.remove (os.path.join (self._directory, fileName))
+                except OSError:
+                    pass
@@ -7,7 +7,7 @@
 
 import numpy as np
 import math
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right
 
 import logging
 logger = logging.getLogger(__name__)
@@ -263,6 +263,23 @@ def interpolate(x1, x2, y1, y2, x):
     return y
 
 
+def interpolate_sorted (xp : list, fp : list, x : float) -> float:
+    """ 
+    Linear interpolation of scalar x in the increasing knots xp using bisect.
+        Same result as np.interp (x, xp, fp) - outside of xp the end values are returned
+    """
+
+    if x < xp[0]:  return fp[0]
+    if x > xp[-1]: return fp[-1]
+
+    j = bisect_right (xp, x) - 1
+    if j == len(xp) - 1 or xp[j] == x: 
+        return fp[j]
+
+    slope = (fp[j+1] - fp[j]) / (xp[j+1] - xp[j])
+    return slope * (x - xp[j]) + fp[j]
+
+
 
 #------------ panel angles -----------------------------------
 
@@ -596,6 +613,89 @@ def newton(f,Df,x0,epsilon = 10e-8 , max_iter= 50, bounds=None):
 
 
 
+def newton_vectorized (f, Df, x0, bounds, epsilon = 10e-8 , max_iter= 50):
+    '''Approximate solutions of f(x)=0 for an array of start values x0 by Newton's method.
+
+    All elements are iterated at once - each element until abs(f(xn)) < epsilon.
+    If f changes sign within bounds of an element, a Newton step leaving the current 
+    bracket is replaced by bisection (safeguarded Newton). Elements without sign change 
+    are clipped to bounds. 
+
+    Parameters
+    ----------
+    f : function f(x, i)
+        Function for which we are searching for a solution f(x)=0 
+        - evaluated for the elements with indices i at x 
+    Df : function Df(x, i)
+        Derivative of f(x) for the elements with indices i
+    x0 : array
+        Initial guesses for the solutions f(x)=0.
+    bounds : tuple of lower and upper bound of x - scalars or arrays
+    epsilon : number
+        Stopping criteria is abs(f(x)) < epsilon.
+    max_iter : integer
+        Maximum number of iterations.
+
+    Returns
+    -------
+    xn : array 
+    niter : iterations needed 
+    '''
+
+    x0    = np.asarray (x0, dtype=float)
+    all_i = np.arange (x0.size)
+    lo    = np.broadcast_to (np.asarray (bounds[0], dtype=float), x0.shape)
+    hi    = np.broadcast_to (np.asarray (bounds[1], dtype=float), x0.shape)
+
+    xn    = np.clip (x0, lo, hi)
+
+    # bracket x_neg, x_pos with f(x_neg) <= 0 <= f(x_pos) 
+    f_lo, f_hi = f(lo, all_i), f(hi, all_i)
+    bracketed  = (f_lo * f_hi) <= 0.0 
+    x_neg = np.where (f_lo <= 0.0, lo, hi)
+    x_pos = np.where (f_lo <= 0.0, hi, lo)
+
+    active = np.ones (x0.shape, dtype=bool)
+
+    for n in range (max_iter):
+
+        i   = np.flatnonzero (active)
+        xi  = xn[i]
+        fxi = f(xi, i)
+
+        # per element convergence 
+        done = np.abs(fxi) < epsilon
+        active[i[done]] = False
+        if np.all (done): break 
+
+        i, xi, fxi = i[~done], xi[~done], fxi[~done]
+
+        # shrink bracket 
+        neg = fxi < 0.0 
+        x_neg[i[neg]]  = xi[neg]
+        x_pos[i[~neg]] = xi[~neg]
+
+        # newton step - safeguarded by bisection if bracketed
+        with np.errstate (divide='ignore', invalid='ignore'):
+            x_new = xi - fxi / Df(xi, i)
+
+        a = np.minimum (x_neg[i], x_pos[i])
+        b = np.maximum (x_neg[i], x_pos[i])
+        outside = ~np.isfinite (x_new) | (x_new < a) | (x_new > b)
+
+        bisect_it = outside &  bracketed[i]
+        stuck     = outside & ~bracketed[i] & ~np.isfinite (x_new)
+
+        x_new[bisect_it] = 0.5 * (a[bisect_it] + b[bisect_it])
+        x_new[stuck]     = xi[stuck]                    # zero derivative - no solution  
+        active[i[stuck]] = False
+
+        xn[i] = np.clip (x_new, lo[i], hi[i])
+
+    return xn, n
+
+
+
 # ---------------------------------------------------------------------------
 # (c) https://github.com/fchollet/nelder-mead 
 # 
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+    Math util pytest classes
+
+"""
+
+import pytest
+
+import numpy as np 
+from math_util import interpolate_sorted
+
+
+def _knots (kind : str) -> tuple[list, list]:
+    """ knots xp, fp of kind for interpolation tests"""
+
+    rng = np.random.default_rng (42)
+
+    if kind == "random":
+        xp = np.sort (rng.uniform (-2, 5, 40))
+    elif kind == "duplicates":
+        xp = np.sort (np.concatenate ((rng.uniform (0, 1, 20), [0.25, 0.25, 0.5, 0.5, 0.5])))
+        xp = np.concatenate (([xp[0]], xp, [xp[-1]]))                  # duplicate end points 
+    elif kind == "two":
+        xp = np.array ([0.0, 1.0])
+    elif kind == "single":
+        xp = np.array ([0.3])
+    else: 
+        raise ValueError (kind)
+
+    fp = rng.uniform (-1, 1, len(xp))
+    return xp.tolist(), fp.tolist()
+
+
+class Test_Math_Util:
+
+    @pytest.mark.parametrize ("kind", ["random", "duplicates", "two", "single"])
+    def test_interpolate_sorted (self, kind): 
+
+        # bisect interpolation must be bit-identical to np.interp 
+
+        xp, fp = _knots (kind)
+
+        rng = np.random.default_rng (7)
+        x  = rng.uniform (xp[0] - 1, xp[-1] + 1, 200).tolist()        # inside and out of range 
+        x += xp                                                         # knots including duplicates
+        x += [xp[0], xp[-1], xp[0] - 1e-12, xp[-1] + 1e-12, -1e10, 1e10]  # end points 
+
+        for xi in x:
+            y_np = np.interp (xi, xp, fp)
+            y    = interpolate_sorted (xp, fp, xi)
+            assert y == y_np, f"x={xi!r}: {y!r} != {y_np!r}"
+
+
+# Main program for testing 
+if __name__ == "__main__":
+
+    test = Test_Math_Util()
+    for kind in ["random", "duplicates", "two", "single"]:
+        test.test_interpolate_sorted (kind)
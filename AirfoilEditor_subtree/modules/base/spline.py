@@ -8,10 +8,10 @@
 """
 import bisect
 import numpy as np
-from copy import deepcopy
 import math
 
-from base.math_util import findMin, newton
+from base.math_util import findMin, newton, newton_vectorized
+from base.cache_util import LRU_Cache
 
 
 #------------ Helper -----------------------------------
@@ -124,17 +124,8 @@ class Spline1D:
         # Info     https://sepwww.stanford.edu/sep/sergey/128A/answers6.pdf for boundary conditions
         #          https://documents.uow.edu.au/~/greg/math321/Lec3.pdf 
 
-        if not (boundary == 'natural' or 'notaknot'): 
-            boundary = 'notaknot'
-
         n = len(x)
-
-        if boundary == 'notaknot' and n < 4:
-            raise ValueError("Spline: 'notaknot' must have at least 4 points")
-        elif n < 3:
-            raise ValueError('Spline: Must have at least 3 points')
-        if n != len(y): 
-            raise ValueError('Spline: Length of x,y is different')
+        self._check_args (n, y, boundary)
             
         if arccos:           # arccos distribution to avoid oscillation at LE          
             self.x = np.arccos(1.0 - x) * 2.0 / np.pi     
@@ -146,16 +137,78 @@ class Spline1D:
         # keep for later evaluation 
         self.y = y
 
+        # extract coefficients of polynoms
+        self.a, self.b, self.c, self.d = self._calc_coefficients (self.x, y, boundary)
+
+
+    @classmethod
+    def multiple (cls, x, ys : list, boundary="notaknot") -> list['Spline1D']:
+        """
+        Build several cubic splines on the same x with different y. 
+        The tridiagonal system is factorized only once and solved for all y together.
+
+        Parameters
+        ----------
+        x : array_like - strongly ascending 
+        ys : list of array_like y values each having length of x 
+        boundary : Type of boundary condition  - see __init__
+
+        Returns
+        -------
+        splines : list of Spline1D - one for each y of ys 
+        """
+
+        n = len(x)
+        for y in ys: 
+            cls._check_args (n, y, boundary)
+
+        Y = np.column_stack (ys)
+        a, b, c, d = cls._calc_coefficients (x, Y, boundary)
+
+        splines = []
+        for i, y in enumerate (ys):
+            spl = cls.__new__(cls)
+            spl.x = x
+            spl.y = y
+            spl._arccos = False
+            spl.a, spl.b, spl.c, spl.d = a[:,i], b[:,i], c[:,i], d[:,i]
+            splines.append (spl)
+        return splines
+
+
+    @staticmethod
+    def _check_args (n : int, y, boundary):
+        # check the arguments for spline construction 
+
+        if boundary == 'notaknot' and n < 4:
+            raise ValueError("Spline: 'notaknot' must have at least 4 points")
+        elif n < 3:
+            raise ValueError('Spline: Must have at least 3 points')
+        if n != len(y): 
+            raise ValueError('Spline: Length of x,y is different')
+
+
+    @classmethod
+    def _calc_coefficients (cls, x, y, boundary):
+        # returns the coefficients a, b, c, d of the polynoms
+        #   y is either 1D (n) or 2D (n, k) - then k splines are solved together 
+
+        if not (boundary == 'natural' or 'notaknot'): 
+            boundary = 'notaknot'
+
+        n = len(x)
+        y = np.array (y, dtype=float)
+
         # only delta x will be relevant 
-        h = np.diff(self.x,1)                        # the differences hi = xi+1 - xi  (length n-1)
+        h = np.diff(x,1)                             # the differences hi = xi+1 - xi  (length n-1)
         if np.amin(h) <= 0.0: 
             raise ValueError('Spline: x is not strictly increasing')
 
         # build the tridiagonal matrix with simple, natural boundary condition
-        A, B, C = self._build_tridiagonalArrays (n, h)
+        A, B, C = cls._build_tridiagonalArrays (n, h)
 
         # build the right hand side 
-        D = self._build_targetArray (n, h, y)
+        D = cls._build_targetArray (n, h, y)
 
         # boundary conditions - overwrite boundaries of A, B, C, D
 
@@ -170,7 +223,7 @@ class Spline1D:
             D[-1] = 0.0     # 2 * 3.0     # 2nd derivative test
 
             # solve tridiagonal system 
-            M = self._solve_tridiagonalsystem(A, B, C, D)
+            M = cls._solve_tridiagonalsystem(A, B, C, D)
 
         elif boundary == 'notaknot':
 
@@ -185,7 +238,7 @@ class Spline1D:
             C[1]  = (h[1]**2  - h[0]**2)  / ( h[1] * (h[0]  + h[1]))    # super diagonal 
             A[-2] = (h[-2]**2 - h[-1]**2) / (h[-2] * (h[-2] + h[-1]))   # sub diagonal 
 
-            M = self._solve_tridiagonalsystem (A, B, C, D, reduced=True)
+            M = cls._solve_tridiagonalsystem (A, B, C, D, reduced=True)
 
             # evaluate the missing M0 and M-1 (eqauls derivate2 at x0 and xn) 
             M[0]  = ((h[0]  + h[1])  * M[1]  - h[0]  * M[2])  / h[1]
@@ -195,27 +248,23 @@ class Spline1D:
         # print_array1D (h,"h") ; 
         # print_array1D (A,"A"); print_array1D (B,"B"); print_array1D (C, "C"); print_array1D (D, "D") 
 
-        # extract coefficients of polynoms
-        self.a = np.zeros (n-1)
-        self.b = np.zeros (n-1)
-        self.c = np.zeros (n-1)
-        self.d = np.zeros (n-1)
-        for i in range(n-1):
-
-            #  a1 = y1
-            #  b1 = b(0) = C'(0) = -M0*h1/2 + (y1-y0)/h1 - (M1-M0)*h1/6 
-            #  c1 = M-1 / 2     
-            #  d1 = (M1 - M1) / (6 * h1)    
-             
-            self.a[i] = y[i]
-            self.b[i] = (y[i+1] - y[i]) / h[i]  - h[i] * (3 * M[i] +  (M[i+1] - M[i])) / 6 
-            self.c[i] = M[i] / 2
-            self.d[i] = (M[i+1]-M[i]) / (6 * h[i])
+        #  a1 = y1
+        #  b1 = b(0) = C'(0) = -M0*h1/2 + (y1-y0)/h1 - (M1-M0)*h1/6 
+        #  c1 = M-1 / 2     
+        #  d1 = (M1 - M1) / (6 * h1)    
+
+        if y.ndim > 1: h = h[:, np.newaxis]         # broadcast h over the k splines 
+
+        a = y[:-1]
+        b = (y[1:] - y[:-1]) / h  - h * (3 * M[:-1] +  (M[1:] - M[:-1])) / 6 
+        c = M[:-1] / 2
+        d = (M[1:] - M[:-1]) / (6 * h)
 
-            # print ("i:%d  a=%6.2f  b=%6.2f  c=%6.2f  d=%6.2f " % (i, self.a[i] , self.b[i] , self.c[i] , self.d[i] ))
+        return a, b, c, d
 
 
-    def _build_tridiagonalArrays (self, n: int, h ):
+    @staticmethod
+    def _build_tridiagonalArrays (n: int, h ):
 
         # returns the tridiagonal arrays A, B, C 
         #   with B[i] = 2
@@ -228,36 +277,38 @@ class Spline1D:
         B = np.empty(n); B.fill(2.0)
 
         A = np.zeros (n-1) 
-        for i in range(n-2):                    
-            A[i] = h[i]  / (h[i] + h[i+1])
+        A[:-1] = h[:-1] / (h[:-1] + h[1:])
 
         C = np.zeros (n-1) 
-        for i in range(1, n-1):                  
-            C[i] = h[i]  / (h[i-1] + h[i])
+        C[1:]  = h[1:]  / (h[:-1] + h[1:])
 
         return A, B, C
 
 
-    def _build_targetArray(self, n: int, h, y):
+    @staticmethod
+    def _build_targetArray(n: int, h, y):
         # returns the right hand side (rhs) array D 
         #   which is the "divided difference" f[xi-1, xi, xi+1]
         #   https://en.wikipedia.org/wiki/Divided_differences
         
         #   d0                            D - rhs array length n
-        #   d1
+        #   d1                                  (or n x k for k right hand sides)
         #   d2 
 
-        D = np.zeros(n)
-        for i in range(1, n - 1): 
-            D[i] = 6.0 * ((y[i + 1] - y[i]) / (h[i]) - (y[i] - y[i-1]) / (h[i-1])) / \
-                         (h[i] + h[i-1])        
+        if y.ndim > 1: h = h[:, np.newaxis]         # broadcast h over the k right hand sides 
+
+        D = np.zeros(y.shape)
+        D[1:-1] = 6.0 * ((y[2:] - y[1:-1]) / (h[1:]) - (y[1:-1] - y[:-2]) / (h[:-1])) / \
+                        (h[1:] + h[:-1])        
         return D
 
 
-    def _solve_tridiagonalsystem (self, A, B, C, D, reduced=False):
+    @staticmethod
+    def _solve_tridiagonalsystem (A, B, C, D, reduced=False):
         # solves the tridiagonal system ABC * M = D  
         #
         # when reduced the inner (n-2) x (n-2) matrix is solved (need for not a knot)
+        # D may have k columns (n x k) - the matrix is factorized once for all right hand sides
         ''''
         TDMA solver, a b c d can be NumPy array type or Python list type.
         refer to http://en.wikipedia.org/wiki/Tridiagonal_matrix_algorithm
@@ -272,13 +323,21 @@ class Spline1D:
 
         iEnd = len(D) - di  # number of equations
 
-        ac, bc, cc, dc = map(np.array, (A, B, C, D)) # copy arrays
+        # factorize - python floats are much faster than numpy scalars in a loop  
+
+        ac, bc, cc = map(list, (A, B, C)) 
+        mc = [0.0] * len(bc) 
         for it in range(1+di, iEnd):
-            mc = ac[it-1]/bc[it-1]
-            bc[it] = bc[it] - mc*cc[it-1] 
-            dc[it] = dc[it] - mc*dc[it-1]
+            mc[it] = ac[it-1]/bc[it-1]
+            bc[it] = bc[it] - mc[it]*cc[it-1] 
+
+        # solve for all right hand sides 
+
+        dc = np.array (D, dtype=float) 
+        for it in range(1+di, iEnd):
+            dc[it] = dc[it] - mc[it]*dc[it-1]
                     
-        M = bc
+        M = np.array (bc)  if dc.ndim == 1 else np.zeros (dc.shape)
         M[-1-di] = dc[-1-di]/bc[-1-di]
 
         for il in range(iEnd-2, -1+di, -1):
@@ -326,12 +385,45 @@ class Spline1D:
         y : scalar or ndarray representing the spline function evaluated at x.
         """
 
-        if isinstance(x, float): 
-            return self._eval (x, der=der) 
-        else: 
-            f = np.zeros (np.size(x))
-            for i, xi in enumerate (x): f[i] = self._eval (xi, der=der) 
-            return f 
+        if isinstance(x, float):
+            return self._eval (x, der=der)
+        else:
+            return self._eval_array (x, der=der)
+
+
+    def _eval_array (self, x, der=0):
+        """
+        Evaluate self or its derivatives - vectorized version of _eval
+
+        Parameters
+        ----------
+        x : array of points to return the value of the spline or its derivatives.
+        der : int, optional - The order of derivative of the spline to compute
+
+        Returns
+        -------
+        y : ndarray representing the spline function evaluated at x
+            - bit-identical to _eval of each point
+        """
+
+        x = np.array (x, dtype=float).ravel()
+
+        x = np.minimum (np.maximum (x, self.x[0]), self.x[-1])
+
+        if self._arccos:
+            x = np.arccos(1.0 - x) * 2.0 / np.pi
+
+        # get the indices j of x in the function intervals of self
+        j = np.minimum (np.searchsorted (self.x, x, side='right') - 1, len(self.x) -2)
+        z = (x - np.asarray(self.x)[j])             # relative coordinate within interval
+
+        # float_power uses libm pow like the scalar z**2 - (ndarray ** 2 is z*z which may differ in last bit)
+        if   der == 0: f = self.a[j] + self.b[j] * z + self.c[j] * np.float_power(z,2) + self.d[j] * np.float_power(z,3)
+        elif der == 1: f = self.b[j] + 2 * self.c[j] * z + 3 * self.d[j] * np.float_power(z,2)
+        elif der == 2: f = 2 * self.c[j] + 6 * self.d[j] * z
+        else:          f = np.zeros (np.size(x))
+
+        return f
 
 
     def _eval (self, x, der=0):
@@ -424,8 +516,8 @@ class Spline2D:
         self.u[0]  = self.u[0].round(10)
         self.u[-1] = self.u[-1].round(10)
         
-        self.splx = Spline1D(self.s, x, boundary=boundary)
-        self.sply = Spline1D(self.s, y, boundary=boundary)
+        # x and y splines share the knots s - solve both with one factorization 
+        self.splx, self.sply = Spline1D.multiple (self.s, [x, y], boundary=boundary)
 
 
     def _calc_s(self, x, y):
@@ -574,6 +666,40 @@ def basisFunction (n, i, u):
     return J 
 
 
+# Bernstein Basis Matrix - LRU cached as Bezier curves are mostly evaluated on fixed u arrays
+
+BASIS_CACHE_SIZE = 32                               # max number of cached basis matrices  
+
+_basis_cache = LRU_Cache (BASIS_CACHE_SIZE, name='Bezier.basisMatrix')   # key: (degree, u as bytes) 
+
+def basisMatrix (n, u : np.ndarray, cached=True) -> np.ndarray:
+    """ 
+    Bernstein basis matrix of degree n evaluated at array u with shape (len(u), n+1).
+    Evaluation of a Bezier is then the product of this matrix with the weights. 
+
+    A derivative 'der' of a Bezier of degree n uses the basis of degree n-der - 
+    so the matrix is shared between a Bezier and the derivative of a higher degree Bezier
+
+    'cached=False' for temporary u arrays which shouldn't push out the fixed ones 
+    """
+
+    if cached: 
+        key = (n, u.tobytes())
+        B = _basis_cache.get (key)
+    else: 
+        B = None 
+
+    if B is None: 
+        B = np.empty ((np.size(u), n+1))
+        for i in range (n+1):
+            B[:,i] = basisFunction (n, i, u)
+        if cached: 
+            B.flags.writeable = False               # shared in cache - protect against changes 
+            _basis_cache.put (key, B)
+
+    return B 
+
+
 
 class Bezier: 
     """
@@ -584,6 +710,8 @@ class Bezier:
          - n > 4: hiher order 
     """
 
+    MEMO_CACHE_SIZE = 256                       # max entries of the eval_y_on_x, eval_x_on_y caches
+
     def __init__ (self, px_or_p : list, py : list|None =None):
         """
         Bezier curve defined by n control points
@@ -600,8 +728,11 @@ class Bezier:
         self._y  = None
         self._u  = None                         # cached parameter u 
 
-        self._y_on_x_cache = {}
-        self._x_on_y_cache = {}
+        # bounded memo caches of the precise and the fast evaluation 
+        self._y_on_x_cache = LRU_Cache (Bezier.MEMO_CACHE_SIZE, name='Bezier.eval_y_on_x')
+        self._x_on_y_cache = LRU_Cache (Bezier.MEMO_CACHE_SIZE, name='Bezier.eval_x_on_y')
+        self._y_on_x_fast_cache = LRU_Cache (Bezier.MEMO_CACHE_SIZE, name='Bezier.eval_y_on_x fast')
+        self._x_on_y_fast_cache = LRU_Cache (Bezier.MEMO_CACHE_SIZE, name='Bezier.eval_x_on_y fast')
 
         self.basisFn = None                     # stored Bezier basis function for test 
 
@@ -665,8 +796,10 @@ class Bezier:
         self._x  = None
         self._y  = None
         self._u =  None
-        self._y_on_x_cache = {}
-        self._x_on_y_cache = {}
+        self._y_on_x_cache.clear()
+        self._x_on_y_cache.clear()
+        self._y_on_x_fast_cache.clear()
+        self._x_on_y_fast_cache.clear()
 
         
     def set_point(self, iPoint : int , px_or_p : tuple|float, py : float|None=None):
@@ -700,8 +833,10 @@ class Bezier:
             self._x  = None
             self._y  = None
             self._u =  None
-            self._y_on_x_cache = {}
-            self._x_on_y_cache = {}
+            self._y_on_x_cache.clear()
+            self._x_on_y_cache.clear()
+            self._y_on_x_fast_cache.clear()
+            self._x_on_y_fast_cache.clear()
 
 
 
@@ -721,9 +856,15 @@ class Bezier:
         if np.array_equal (u, self._u) and (not self._x is None) and der == 0 :
             x = self._x                             # old u array - use cache 
             y = self._y 
-        else: 
+        elif np.isscalar(u):
             x = self._eval_1D (self._px, u, der=der)   # recalc 
             y = self._eval_1D (self._py, u, der=der)
+        else: 
+            x, y = self._eval_2D (u, der=der)       # recalc x,y together 
+
+            if der == 0:                            # fast results are based on the cached x,y
+                self._y_on_x_fast_cache.clear()
+                self._x_on_y_fast_cache.clear()
 
         if not np.isscalar(u) and der == 0:         # cache result for der=0 if u is array
             self._u = u 
@@ -752,24 +893,28 @@ class Bezier:
 
         Parameters
         ----------
-        x :   Scalar - x-value 
+        x :   Scalar or an array - x-value 
         fast : bool, optional - only a linear interpolation of u is made .
 
         Returns
         -------
-        y : Scalar - y evaluated at x 
+        y : Scalar or an array - y evaluated at x 
         """
 
+        if not np.isscalar (x):
+            return self._eval_y_on_x_array (x, fast=fast, epsilon=epsilon)
+
         # check for cached value 
-        try:
-            y = self._y_on_x_cache [x]
+        y = self._y_on_x_cache.get (x)
+        if y is not None: 
             return y
-        except: 
-            pass
-
 
         if fast and (not self._x is None) and (x >= self._x[0] and x <= self._x[-1]):
 
+            y = self._y_on_x_fast_cache.get (x)
+            if y is not None: 
+                return y
+
             # find closest index
             i = min(bisect.bisect(self._x, x)-1, len(self._x) -2)
 
@@ -779,6 +924,8 @@ class Bezier:
             # evaluate y from u 
             y =  self._eval_1D (self._py, u)
 
+            self._y_on_x_fast_cache.put (x, y)
+
         else: 
 
             if x == self._eval_1D(self._px,0.0):    # avoid numerical issues of Newton 
@@ -800,7 +947,7 @@ class Bezier:
             y =  self._eval_1D (self._py, u)
 
             # cache value - only not fast
-            self._y_on_x_cache [x] = y
+            self._y_on_x_cache.put (x, y)
 
         return y
         
@@ -814,34 +961,42 @@ class Bezier:
 
         Parameters
         ----------
-        y :   Scalar - y-value 
+        y :   Scalar or an array - y-value 
         fast : bool, optional - only a linear interpolation of u is made .
 
         Returns
         -------
-        x : Scalar - x evaluated at y 
+        x : Scalar or an array - x evaluated at y 
         """
 
+        if not np.isscalar (y):
+            return self._eval_x_on_y_array (y, fast=fast)
+
         # check for cached value 
-        try:
-            x = self._x_on_y_cache [y]
+        x = self._x_on_y_cache.get (y)
+        if x is not None: 
             return x
-        except: 
-            pass
 
         if fast and (not self._y is None) and (y <= self._y[0] and y >= self._y[-1]):
+
+            x = self._x_on_y_fast_cache.get (y)
+            if x is not None: 
+                return x
+
             i = min(bisect.bisect(self._y, y)-1, len(self._y) -2)
             # interpolate u 
             u = ((self._u[i+1]-self._u[i])/(self._y[i+1]-self._y[i])) * (y - self._y[i]) + self._u[i]
             # evaluate y from u 
             x = self._eval_1D (self._px, u)
+
+            self._x_on_y_fast_cache.put (y, x)
         else: 
             u = findMin (lambda u: abs(self._eval_1D(self._py,u) - y), 0.5, bounds=(0, 1)) 
             x =  self._eval_1D (self._px, u)
             # print ("y: ",y, "  x evaluated ", x)
 
             # cache value - only not fast
-            self._x_on_y_cache [y] = x
+            self._x_on_y_cache.put (y, x)
 
         return x
 
@@ -912,7 +1067,119 @@ class Bezier:
     # -------------  end public --------------------
 
 
-    def _eval_1D (self, pxy, u, der=0):
+    def _eval_y_on_x_array (self, x, fast=True, epsilon=10e-10):
+        # vectorized version of eval_y_on_x for an array of x 
+
+        x = np.asarray (x, dtype=float)
+        u = np.zeros (x.shape)
+
+        if fast and (not self._x is None):
+            in_range = (x >= self._x[0]) & (x <= self._x[-1])
+            u[in_range] = np.interp (x[in_range], self._x, self._u)
+        else: 
+            in_range = np.zeros (x.shape, dtype=bool) 
+
+        # the others with newton iteration on the curve 
+        precise = ~in_range
+        if np.any (precise):
+            x_pre  = x[precise]
+            u0 = np.clip (x_pre, 0.05, 0.95)                # good start value für newton iteration
+            u[precise] = self._solve_u (self._px, x_pre, u0, epsilon=epsilon)
+
+        return self._eval_1D (self._py, u, cached=False)
+
+
+    def _eval_x_on_y_array (self, y, fast=True, epsilon=10e-10):
+        # vectorized version of eval_x_on_y for an array of y 
+
+        y = np.asarray (y, dtype=float)
+        u = np.zeros (y.shape)
+
+        if fast and (not self._y is None):
+            in_range = (y <= self._y[0]) & (y >= self._y[-1])
+            u[in_range] = np.interp (y[in_range], self._y[::-1], self._u[::-1])
+        else: 
+            in_range = np.zeros (y.shape, dtype=bool) 
+
+        # the others with newton iteration on the curve 
+        precise = ~in_range
+        if np.any (precise):
+            y_pre  = y[precise]
+            u0 = np.full (y_pre.shape, 0.5)
+            u[precise] = self._solve_u (self._py, y_pre, u0, epsilon=epsilon)
+
+        return self._eval_1D (self._px, u, cached=False)
+
+
+    def _solve_u (self, pxy, targets : np.ndarray, u0 : np.ndarray, epsilon=10e-10, max_iter=50) -> np.ndarray:
+        """
+        Vectorized Newton iteration to find u with pxy(u) = target for all targets.
+
+        Each element iterates until abs(pxy(u) - target) < epsilon - the same stop criteria 
+        as scalar newton. If the target lies within pxy(0)..pxy(1) a Newton step leaving the 
+        current bracket is replaced by bisection. Without bracket u is clipped to 0..1. 
+        """
+
+        t = targets
+        u0 = np.array (u0, dtype=float)
+
+        # linear and quadratic Bezier (e.g. banana) - closed form solution as start value
+        closed_form = len(pxy) <= 3
+        if closed_form:
+            u_cf = self._solve_u_quadratic (pxy, t)
+            solved = np.isfinite (u_cf)
+            u0[solved] = u_cf[solved]
+
+        # avoid numerical issues of Newton at the end points
+        u0[t == pxy[0]]  = 0.0
+        u0[t == pxy[-1]] = 1.0
+
+        # newton only for elements not already solved by the start value
+        todo = np.ones (t.shape, dtype=bool)
+        if closed_form:
+            todo = np.abs (self._eval_1D (pxy, u0, cached=False) - t) >= epsilon
+            if not np.any (todo):
+                return u0
+
+        t_todo = t[todo]
+        u, niter = newton_vectorized (lambda u, i: self._eval_1D (pxy, u, cached=False) - t_todo[i],
+                                      lambda u, i: self._eval_1D (pxy, u, der=1, cached=False),
+                                      u0[todo], bounds=(0.0, 1.0), epsilon=epsilon, max_iter=max_iter)
+        u0[todo] = u
+        return u0
+
+
+    @staticmethod
+    def _solve_u_quadratic (pxy, targets : np.ndarray) -> np.ndarray:
+        # returns u in 0..1 of a linear or quadratic Bezier with pxy(u) = target
+        #   - nan if there is no solution in 0..1
+
+        if len(pxy) == 2:
+            p0, p2 = pxy
+            p1 = (p0 + p2) / 2                                  # linear as degenerated quadratic
+        else:
+            p0, p1, p2 = pxy
+
+        # pxy(u) - t = a*u**2 + b*u + c
+        a = p0 - 2 * p1 + p2
+        b = 2 * (p1 - p0)
+        c = p0 - targets
+
+        with np.errstate (divide='ignore', invalid='ignore'):
+            if abs(a) < 1e-12:
+                u = - c / b
+            else:
+                # numerically stable roots (Numerical Recipes)
+                q  = -0.5 * (b + np.copysign (np.sqrt (b * b - 4 * a * c), b))
+                u1 = q / a
+                u2 = c / q
+                u  = np.where ((u1 >= -1e-12) & (u1 <= 1 + 1e-12), u1, u2)
+
+        valid = (u >= -1e-12) & (u <= 1 + 1e-12)
+        return np.where (valid, np.clip (u, 0.0, 1.0), np.nan)
+
+
+    def _eval_1D (self, pxy, u, der=0, cached=True):
         #
         #                    Bezier Core
         #
@@ -920,46 +1187,60 @@ class Bezier:
         #   pxy:  either x or y coordinates of the bezier control points
         #   u:    Scalar or an array of normed arc length 0..1 at which to return bezier value
         #   der:  optional derivative - either 0,1 or 2 
+        #   cached: optional - cache basis matrix of array u (False for temporary arrays)
 
         if u is None or (np.isscalar(u) and (u > 1.0 or u < 0.0)):
             raise ValueError ("Bezier: parameter u = %s not valid " %u)
 
-        # init result (array)
+        # http://math.aalto.fi/~ahniemi/hss2012/Notes06.pdf
+
         if np.isscalar(u):
             # optimize for end points 
             if u == 0.0 and der == 0:
                 return pxy[0]
             elif u == 1.0 and der == 0:
                 return pxy[-1]
-            else:
-                bezier = 0.0 
-            
+
+            weights, n = self._weights (pxy, der)
+
+            # sum up bernstein polynomials with python floats - fast for a single u 
+            bezier = 0.0 
+            u1 = 1.0 - u 
+            for i, w in enumerate (weights):
+                bezier += Ni(n, i) * (u ** i) * u1 ** (n - i) * w
+            return bezier
+
         else: 
-            bezier = np.zeros (np.size(u))
+            u = np.asarray (u, dtype=float)
+            weights, n = self._weights (pxy, der)
 
-        # http://math.aalto.fi/~ahniemi/hss2012/Notes06.pdf
+            return basisMatrix (n, u, cached=cached) @ weights 
 
-        n = np.size(pxy) - 1                            # n - degree of Bezier 
-        weights = deepcopy(pxy)                         # der = 0: weights = points 
-        if der > 0:                                     
-            weights = np.ediff1d(weights) * n           # new weight = difference * n 
-            n = n - 1                                   # lower 1 degree 
-        if der > 1:                                     # derivative 2  
-            weights = np.ediff1d(weights) * n           # new weight = difference * n                           
-            n = n - 1                                   # lower 1 degree 
-        if der > 2:                                     # derivative 3  
-            weights = np.ediff1d(weights) * n           # new weight = difference * n                           
-            n = n - 1                                   # lower 1 degree 
 
-        # test self.basisFn = []   
-    
-        for i in range (len(weights)):
-            
-            # collect bernstein Polynomial self.basisFn.append (basisFunction(n, i, u))  
+    def _eval_2D (self, u, der=0):
+        # evaluates x and y of self at array u with a single matrix product
+
+        u = np.asarray (u, dtype=float)
+
+        wx, n = self._weights (self._px, der)
+        wy, n = self._weights (self._py, der)
+
+        xy = basisMatrix (n, u) @ np.column_stack ((wx, wy))
+        return xy[:,0], xy[:,1]
+
 
-            bezier += basisFunction(n, i, u) * weights[i] 
+    @staticmethod
+    def _weights (pxy, der=0) -> tuple [np.ndarray, int]:
+        # returns the weights and the degree n of the bezier polynomial for derivative der  
+
+        weights = np.asarray (pxy, dtype=float)         # der = 0: weights = points 
+        n = np.size(weights) - 1                        # n - degree of Bezier 
+
+        for _ in range (min(der,3)):                    # derivative 1,2,3 
+            weights = np.ediff1d(weights) * n           # new weight = difference * n 
+            n = n - 1                                   # lower 1 degree 
 
-        return bezier
+        return weights, n
 
 
 
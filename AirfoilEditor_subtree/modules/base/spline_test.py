@@ -55,6 +55,44 @@ class Test_Spline:
 
 
 
+    def test_spline_1D_eval_array (self): 
+
+        # vectorized array evaluation must be bit-identical to scalar evaluation 
+
+        x = np.linspace (0, 1, 50) ** 2
+        y = np.sin (x * 5)
+
+        for arccos in [False, True]:
+
+            spl  = Spline1D (x,y, arccos=arccos)
+            xnew = np.linspace (-0.1, 1.1, 500)
+
+            for der in [0, 1, 2, 3]:
+                y_arr = spl.eval (xnew, der=der)
+                y_sca = np.array ([spl.eval (float(xi), der=der) for xi in xnew])
+                assert np.array_equal (y_arr, y_sca) 
+
+
+    def test_spline_1D_multiple (self): 
+
+        # splines sharing one factorization must be identical to single splines 
+
+        x  = [  0, 0.5,  2,  3,  4,  5,  7]  
+        y1 = [  0,  3,  0,  2,  0,  2,  0]  
+        y2 = [  1,  2,  4,  2,  1,  0, -1]  
+
+        for boundary in ["natural", "notaknot"]:
+
+            spl1, spl2 = Spline1D.multiple (x, [y1, y2], boundary=boundary)
+
+            for spl, y in [(spl1, y1), (spl2, y2)]:
+                spl_single = Spline1D (x, y, boundary=boundary)
+                assert np.array_equal (spl.a, spl_single.a)
+                assert np.array_equal (spl.b, spl_single.b)
+                assert np.array_equal (spl.c, spl_single.c)
+                assert np.array_equal (spl.d, spl_single.d)
+
+
     def test_spline_2D (self): 
 
         x = [  0, 0.5,  2,  3,  4,  5,  7]  
@@ -94,9 +132,125 @@ class Test_Spline:
         pass
 
 
+def bench_spline_1D_eval ():
+    """ micro benchmark of Spline1D.eval - scalar loop versus array evaluation"""
+
+    from timeit import default_timer as timer
+
+    x = np.linspace (0, 1, 200) ** 2
+    y = np.sin (x * 5)
+    spl = Spline1D (x,y, arccos=True)
+
+    for n in [100, 1000, 10000]:
+
+        xnew = np.linspace (0, 1, n)
+
+        start = timer()
+        for xi in xnew: spl._eval (xi)
+        t_loop = timer() - start
+
+        start = timer()
+        spl.eval (xnew)
+        t_array = timer() - start
+
+        print (f"n={n:6d}   loop {t_loop*1000:8.3f}ms   array {t_array*1000:8.3f}ms   speedup {t_loop/t_array:6.1f}")
+
+
+class Test_Bezier:
+
+    def test_bezier_eval (self): 
+
+        px = [   0,  0.0, 0.3,   1]
+        py = [   0, 0.06, 0.12,  0]
+        bez = Bezier (px, py)
+
+        u  = np.linspace (0, 1, 50)
+
+        for der in [0, 1, 2]:
+
+            x, y = bez.eval (u, der=der)
+
+            # compare with sum of single basis functions 
+            weights = np.array(py, dtype=float)
+            n = len(py) - 1
+            for _ in range (der):
+                weights = np.ediff1d(weights) * n
+                n -= 1
+            y_sum = sum ([basisFunction (n, i, u) * weights[i] for i in range(n+1)])
+            assert np.allclose (y, y_sum, rtol=0, atol=1e-14)
+
+            # scalar evaluation 
+            assert abs(bez.eval_y (u[17], der=der) - y[17]) < 1e-14
+
+        # basis matrix of same u is taken from cache 
+        assert basisMatrix (3, u) is basisMatrix (3, np.linspace (0, 1, 50))
+
+
+    def test_bezier_eval_on_array (self): 
+
+        # array inversion must have the precision of scalar evaluation 
+
+        px = [   0,  0.0, 0.3,   1]
+        py = [   0, 0.06, 0.12,  0]
+        bez = Bezier (px, py)
+
+        x = np.linspace (0, 1, 20)
+        y_arr = bez.eval_y_on_x (x, fast=False)
+        y_sca = np.array ([bez.eval_y_on_x (float(xi), fast=False) for xi in x])
+        assert np.allclose (y_arr, y_sca, rtol=0, atol=1e-10)
+
+        # chord like, decreasing y 
+        bez = Bezier ([0, 0.5, 1], [1, 0.95, 0.4])
+
+        y = np.linspace (0.4, 1, 20)
+        x_arr = bez.eval_x_on_y (y, fast=False)
+        assert np.allclose (bez.eval_y_on_x (x_arr, fast=False), y, rtol=0, atol=1e-8)
+
+        # banana like quadratic and linear Bezier are solved in closed form
+        for px, py in [([0, 0.3, 1], [0, 0.2, 0]), ([0, 1], [0.75, 0.6])]:
+            bez = Bezier (px, py)
+            x = np.linspace (0, 1, 20)
+            y_arr = bez.eval_y_on_x (x, fast=False)
+            y_sca = np.array ([bez.eval_y_on_x (float(xi), fast=False) for xi in x])
+            assert np.allclose (y_arr, y_sca, rtol=0, atol=1e-10)
+
+
+
+    def test_bezier_memo_cache (self): 
+
+        # memo caches are bounded and count hits and misses 
+
+        bez = Bezier ([0, 0.5, 1], [1, 0.95, 0.4])
+        cache = bez._y_on_x_cache
+
+        x = np.linspace (0, 1, Bezier.MEMO_CACHE_SIZE + 50)
+        for xi in x:
+            bez.eval_y_on_x (float(xi), fast=False)
+        assert len(cache) == Bezier.MEMO_CACHE_SIZE
+        assert cache.misses == len(x)
+
+        y = bez.eval_y_on_x (float(x[-1]), fast=False)
+        assert cache.hits == 1
+        assert y == cache.get (float(x[-1]))
+
+        # least recently used are evicted 
+        assert not (float(x[0]) in cache) 
+
+        bez.set_point (1, 0.4, 0.9)
+        assert len(cache) == 0 
+
+
 # Main program for testing 
 if __name__ == "__main__":
 
     test = Test_Spline()
     test.test_spline_1D()
+    test.test_spline_1D_eval_array()
     test.test_spline_2D()
+
+    test = Test_Bezier()
+    test.test_bezier_eval()
+    test.test_bezier_eval_on_array()
+    test.test_bezier_memo_cache()
+
+    bench_spline_1D_eval ()
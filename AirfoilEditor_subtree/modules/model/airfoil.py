@@ -6,6 +6,7 @@
 
 """
 import os
+import warnings
 from typing                 import Type, override
 from enum                   import StrEnum
 from pathlib                import Path
@@ -14,6 +15,7 @@ import numpy as np
 
 from base.math_util         import * 
 from base.common_utils      import * 
+from base.cache_util        import File_Cache
 from model.airfoil_geometry import Geometry_Splined, Geometry, Geometry_Bezier, Geometry_HicksHenne
 from model.airfoil_geometry import Line, Side_Airfoil_Bezier
 
@@ -59,6 +61,8 @@ class Airfoil:
     isBezierBased       = False
     isHicksHenneBased   = False
 
+    file_cache : File_Cache | None = None            # opt-in binary cache of parsed .dat files
+
 
     def __init__(self, x= None, y = None, name = None,
                  geometry : Type[Geometry]  = None, 
@@ -441,15 +445,64 @@ class Airfoil:
             sourcePathFile = None 
 
         if sourcePathFile:
+
+            cached = self.file_cache.get (sourcePathFile) if self.file_cache else None 
+            if cached: 
+                self._name, (self._x, self._y) = cached
+                return 
+
             f = open(sourcePathFile, 'r')
             file_lines = f.readlines()
             f.close()
             self._name, self._x, self._y = self._loadLines(file_lines)
 
+            if self.file_cache:
+                self.file_cache.put (sourcePathFile, self._name, [self._x, self._y])
+
+
+    @classmethod
+    def set_file_cache (cls, directory : str | None):
+        """ 
+        Activate binary cache of parsed .dat files in directory - None deactivates the cache
+        """
+        cls.file_cache = File_Cache (directory) if directory else None
+
 
     def _loadLines (self, file_lines):
 
         # returns the name and x,y (np array) of the airfoil file 
+        #   fast path parses all coordinate lines at once - if it fails use tolerant line parser 
+
+        try: 
+            return self._loadLines_fast (file_lines)
+        except Exception: 
+            return self._loadLines_tolerant (file_lines)
+
+
+    def _loadLines_fast (self, file_lines):
+
+        # returns the name and x,y (np array) of the airfoil file - raises exception if 
+        #   a line can't be parsed (e.g. having only one value) or there are no coordinates 
+
+        name = file_lines[0].strip()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter ("error")                     # e.g. no coordinates 
+            xy = np.loadtxt (file_lines[1:], usecols=(0,1), comments=None, ndmin=2, dtype=float)
+
+        x, y = xy[:,0], xy[:,1]
+
+        # avoid duplicate, dirty coordinates - compared with previous point like tolerant parser 
+        duplicate = (x == np.append (-9999.9, x[:-1])) & (y == np.append (-9999.9, y[:-1]))
+        for _ in range (np.count_nonzero (duplicate)):
+            logging.warning ("Airfoil '%s' has duplicate coordinates - skipped." % self._name)
+
+        return name, x[~duplicate], y[~duplicate]
+
+
+    def _loadLines_tolerant (self, file_lines):
+
+        # returns the name and x,y (np array) of the airfoil file - line by line 
 
         x = []
         y = []
@@ -523,6 +576,27 @@ class Airfoil:
             newPathFileName from dir and destName 
         """        
 
+        airfoil = self.copy_for_save (dir=dir, destName=destName)
+
+        if te_gap is not None: 
+            airfoil.geo.set_te_gap (te_gap)
+
+        # save it to file 
+        airfoil.save ()
+
+        return airfoil.pathFileName
+
+
+    def copy_for_save (self, dir = None, destName = None) -> 'Airfoil':
+        """
+        Returns a copy of self with the name and pathFileName it will be saved with 
+        in 'save_copyAs' - the directory will be created 
+
+        Args: 
+            dir: -optional- new directory for the airfoil 
+            destName: - optional- new name
+        """        
+
         # determine (new) airfoils name  if not provided
         if not destName:
             if self.name: 
@@ -544,15 +618,7 @@ class Airfoil:
         # create temp new airfoil 
         if not self.isLoaded: self.load()
 
-        airfoil = self.asCopy (name=destName, pathFileName=newPathFileName)
-
-        if te_gap is not None: 
-            airfoil.geo.set_te_gap (te_gap)
-
-        # save it to file 
-        airfoil.save ()
-
-        return airfoil.pathFileName
+        return self.asCopy (name=destName, pathFileName=newPathFileName)
 
 
     def asCopy (self, pathFileName = None, 
@@ -588,10 +654,14 @@ class Airfoil:
         pathFileName =  os.path.splitext(self.pathFileName)[0] + ".dat"
 
         with open(pathFileName, 'w+') as file:
-            file.write("%s\n" % self.name)
-            for i in range (len(self.x)):
-                file.write("%.7f %.7f\n" %(self.x[i], self.y[i]))
-            file.close()
+            file.write(self.as_dat_text ())
+
+
+    def as_dat_text (self) -> str:
+        """ returns self in .dat format - name and a line 'x y' per coordinate"""
+
+        lines = ["%.7f %.7f\n" % xy for xy in zip (self.x.tolist(), self.y.tolist())]
+        return "%s\n" % self.name + "".join (lines)
 
 
     def normalize (self, just_basic=False):
@@ -634,6 +704,28 @@ class Airfoil:
         self.set_isBlendAirfoil (True)
 
 
+    def set_blend_result (self, airfoil1 : 'Airfoil', airfoil2 : 'Airfoil', blendBy : float,
+                          x : np.ndarray, y : np.ndarray, geometry_class = None ):
+        """ 
+        sets the coordinates x,y of a blend of two airfoils which was calculated outside 
+            of self e.g. in a worker process - self is changed like with 'do_blend'
+        
+        Args: 
+            geometry_class: optional - geo strategy of blend - either GEO_BASIC or GEO_SPLINE
+        """
+
+        # other geo strategy? 
+        if not geometry_class is None and geometry_class != self._geometry_class:
+            geo : Geometry = geometry_class (self.x, self.y)
+            geo.set_blend_result (airfoil1.geo, airfoil2.geo, blendBy, x, y)
+
+            self._handle_geo_changed (geo=geo) 
+        else:
+            self.geo.set_blend_result (airfoil1.geo, airfoil2.geo, blendBy, x, y)
+
+        self.set_isBlendAirfoil (True)
+
+
 
 
 
@@ -59,6 +59,7 @@ from copy               import copy, deepcopy
 from base.math_util    import * 
 from base.spline import Spline1D, Spline2D, Bezier
 from base.spline import HicksHenne
+from base.cache_util import LRU_Cache
 
 import logging
 logger = logging.getLogger(__name__)
@@ -956,9 +957,12 @@ class Line_Splined (Line):
 
     """
 
+    YFN_CACHE_SIZE = 128                        # max entries of yFn cache 
+
     def __init__ (self, *args, **kwargs):
 
         self._spline    = None                  # 1D Spline to get max values of line
+        self._yFn_cache = LRU_Cache (Line_Splined.YFN_CACHE_SIZE, name='Line_Splined.yFn')
         super().__init__ (*args, **kwargs) 
 
   
@@ -967,13 +971,22 @@ class Line_Splined (Line):
         """ spline representation of self """
         if self._spline is None: 
             self._spline = Spline1D (self.x, self.y)
+            self._yFn_cache.clear()
         return self._spline
 
 
     def yFn (self,x):
         """ returns interpolated y values based on a x-value
         """
-        return self.spline.eval (x)
+        if not isinstance (x, float):
+            return self.spline.eval (x)
+
+        spline = self.spline                    # ensure cache belongs to current spline 
+        y = self._yFn_cache.get (x)
+        if y is None: 
+            y = spline.eval (x)
+            self._yFn_cache.put (x, y)
+        return y
 
 
     # ------------------ private ---------------------------
@@ -984,6 +997,7 @@ class Line_Splined (Line):
 
         super()._reset()
         self._spline     = None
+        self._yFn_cache.clear()
 
 
 
@@ -2217,6 +2231,24 @@ class Geometry ():
             self._changed (Geometry.Mod.BLEND, blendBy)
 
 
+    def set_blend_result (self, geo1 : 'Geometry', geo2 : 'Geometry', blendBy : float,
+                          x : np.ndarray, y : np.ndarray):
+        """ 
+        sets the coordinates x,y of a blend of two geometries which was calculated outside 
+            of self e.g. in a worker process - self, geo1 and geo2 are changed like with 'blend'
+        """
+
+        if geo1 and geo2: 
+            if not geo1._isNormalized(): geo1.normalize()
+            if not geo2._isNormalized(): geo2.normalize()
+
+            self._x = np.asarray (x)
+            self._y = np.asarray (y)
+            self._reset()
+
+            self._changed (Geometry.Mod.BLEND, blendBy)
+
+
     # ------------------ private ---------------------------
 
     def _le_real_norm2 (self) -> float:
@@ -2440,21 +2472,9 @@ class Geometry_Splined (Geometry):
         
         Using spline interpolation  
         """
-        # evaluate the corresponding y-values on lower side 
-        upper_y = np.zeros (len(new_x))
- 
-        for i, x in enumerate (new_x):
- 
-            # nelder mead find min boundaries 
-            uStart = 0.0
-            uEnd   = self.uLe 
-            uGuess = interpolate (0.0, 1.0, uStart, uEnd, x)   # best guess as start value
-
-            u = findMin (lambda xlow: abs(self.spline.evalx(xlow) - x), uGuess, 
-                        bounds=(uStart, uEnd), no_improve_thr=1e-8) 
-
-            # with the new u-value we get the y value on lower side 
-            upper_y[i] = self.spline.evaly (u)
+        # evaluate the corresponding y-values on upper side 
+        u = self._u_on_x (Line.Type.UPPER, new_x)
+        upper_y = self.spline.evaly (u)
 
         upper_y = np.round(upper_y, 10)
 
@@ -2469,39 +2489,12 @@ class Geometry_Splined (Geometry):
         Using spline interpolation  
         """
         # evaluate the corresponding y-values on lower side 
-        n = len(new_x)
-        lower_y = np.zeros (n)
- 
-        for i, x in enumerate (new_x):
-
-            # first and last point from current lower to avoid numerical issues 
-            if i == 0: 
-                lower_y[i] = self.lower.y[0]
-            elif i == (n - 1):
-                lower_y[i] = self.lower.y[-1]
-            else:
- 
-                # nelder mead find min boundaries 
-                uStart = self.uLe
-                uEnd   = 1.0 
-                uGuess = interpolate (new_x[0], new_x[-1], uStart, 1.0, x)   # best guess as start value
-
-                umin = max (uStart, uGuess - 0.1 )
-                umax = min (uEnd, uGuess + 0.1 )
-
-                # find min using Secant - fast but not for LE with high curvature 
-                if i > n/10: 
-                    max_iter = 4 
-                    u, niter  = secant_fn (lambda u: self.spline.evalx(u) - x,
-                                            umin, umax, max_iter)
-                else: 
-                # find u value for x using Nelder Mead 
-                    u = findMin (lambda u: abs(self.spline.evalx(u) - x), uGuess, 
-                                bounds=(uStart, uEnd), no_improve_thr=1e-10) 
+        u = self._u_on_x (Line.Type.LOWER, new_x)
+        lower_y = self.spline.evaly (u)
 
-                # with the new u-value we get the y value on lower side 
-                # print (i, u, uGuess)
-                lower_y[i] = self.spline.evaly (u)
+        # first and last point from current lower to avoid numerical issues 
+        lower_y[0]  = self.lower.y[0]
+        lower_y[-1] = self.lower.y[-1]
 
         lower_y = np.round(lower_y, 12)
 
@@ -2629,6 +2622,52 @@ class Geometry_Splined (Geometry):
     # ------------------ private ---------------------------
 
 
+    def _u_on_x (self, side : Line.Type, xIn, uLe : float = None) -> np.ndarray: 
+        """
+        Vectorized inversion of spline.evalx(u) = x for all xIn on 'side'.
+
+        x(u) is monotonic on each side - a Newton iteration with the spline derivative,
+        safeguarded by bisection within the side, is made for all points at once.  
+
+        Parameters
+        ----------
+        side : either UPPER or LOWER
+        xIn : x-coordinates on 'side' 
+        uLe : optional u of leading edge as side boundary - default self.uLe
+
+        Returns
+        -------
+        u : np array - u values of xIn on 'side'
+        """
+
+        spline = self.spline 
+        uLe    = self.uLe if uLe is None else uLe 
+
+        if side == Line.Type.LOWER: 
+            uStart, uEnd = uLe, 1.0 
+        elif side == Line.Type.UPPER:
+            uStart, uEnd = 0.0, uLe
+        else:
+            raise ValueError ("'%s' not supported" % side.value[0])
+
+        x = np.asarray (xIn, dtype=float)
+
+        # start values - linear interpolation in the knots of side 
+        in_side = (spline.u >= uStart) & (spline.u <= uEnd)
+        u_knots = spline.u [in_side] 
+        x_knots = spline.x [in_side]
+        order   = np.argsort (x_knots)
+        u0 = np.interp (x, x_knots[order], u_knots[order])
+
+        # dx/du = dx/ds * ds/du 
+        ds_du = spline.s[-1] - spline.s[0]
+
+        u, niter = newton_vectorized (lambda u, i: spline.evalx (u) - x[i],
+                                      lambda u, i: spline.evalx (u, der=1) * ds_du, 
+                                      u0, bounds=(uStart, uEnd), epsilon=1e-10)
+        return u
+
+
     def _reset_spline (self):
         """ reinit self spline data if x,y has changed""" 
         self._curvature  = None                 # curvature 
@@ -2697,28 +2736,8 @@ class Geometry_Splined (Geometry):
 
         iLe = np.argmin (self.x)
 
-        if side == Line.Type.LOWER: 
-            uStart = self.spline.u[iLe] 
-            uEnd   = self.spline.u[-1]  
-            uGuess = 0.75          
-        elif side == Line.Type.UPPER:
-            uStart = self.spline.u[0] 
-            # uEnd   = self.spline.u[iLe-1]   
-            uEnd   = self.spline.u[iLe]   
-            uGuess = 0.25         
-        else:
-            raise ValueError ("'%s' not supported" % side.value[0])
-
-        ux = np.zeros (len(xIn))
-        for i, xi in enumerate (xIn): 
-
-            # find matching u to x-value 
-            #   no_improve_thr= 10e-6 is sufficient to get average 10e-10  tolerance
-            ux[i] = findMin (lambda u: abs(self.spline.evalx(u) - xi), uGuess, bounds=(uStart, uEnd), 
-                             no_improve_thr= 10e-6) 
-            uGuess = ux[i]
-
-        # get y coordinate from u          
+        # find matching u to x-values and get y coordinate from u          
+        ux   = self._u_on_x (side, xIn, uLe=self.spline.u[iLe])
         yOut = self.spline.evaly (ux)
 
         # ensure Le is 0,0 and Te is at 1
@@ -2953,10 +2972,7 @@ class Geometry_Bezier (Geometry):
         Using bezier interpolation  
         """
         # evaluate the corresponding y-values on upper side 
-        upper_y = np.zeros (len(new_x))
- 
-        for i, x in enumerate (new_x):
-            upper_y[i] = self.upper.bezier.eval_y_on_x (x, fast=True)  
+        upper_y = self.upper.bezier.eval_y_on_x (new_x, fast=True)  
 
         upper_y = np.round(upper_y, 10)
 
@@ -2969,18 +2985,12 @@ class Geometry_Bezier (Geometry):
         Using bezier interpolation  
         """
         # evaluate the corresponding y-values on lower side 
-        lower_y = np.zeros (len(new_x))
- 
         # !! bezier must be evaluated with u to have x,y !! 
-        for i, x in enumerate (new_x):
+        lower_y = self.lower.bezier.eval_y_on_x (new_x, fast=True)  
 
-            # first and last point from current lower to avoid numerical issues 
-            if i == 0: 
-                lower_y[i] = self.lower.y[0]
-            elif i == (len(new_x) -1):
-                lower_y[i] = self.lower.y[-1]
-            else:
-                lower_y[i] = self.lower.bezier.eval_y_on_x (x, fast=True)  
+        # first and last point from current lower to avoid numerical issues 
+        lower_y[0]  = self.lower.y[0]
+        lower_y[-1] = self.lower.y[-1]
 
         lower_y = np.round(lower_y, 10)
 
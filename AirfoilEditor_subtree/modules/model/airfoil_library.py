@@ -0,0 +1,422 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+    Airfoil library - persistent index of airfoil files with metrics for search
+
+    The metrics of each .dat file are calculated once using the basic geometry
+    and stored in a compact index file. Filter and nearest neighbour queries
+    run on the index without loading coordinates.
+
+        lib = Airfoil_Library ("my_airfoils.npz")
+        lib.scan ("c:/airfoils")                    # only new or changed files are loaded
+        lib.save ()
+
+        lib.filter (max_thick=(0.115, 0.125), max_camb_x=(0.35, 0.40))
+        lib.nearest (max_thick=0.12, max_camb=0.02, n=5)
+        lib.nearest_to (airfoil, n=5)
+
+        lib.rescan ()                               # all directories scanned so far 
+
+"""
+import os
+import fnmatch
+
+import numpy as np
+
+from model.airfoil          import Airfoil, GEO_BASIC
+
+import logging
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.WARNING)
+
+
+class Airfoil_Library:
+    """
+    Persistent index of airfoil .dat files with metrics like thickness and camber.
+
+    Files are identified by their absolute path. A file is (re)calculated in 'scan'
+    only if it is new or its mtime or size changed. Files which couldn't be
+    loaded get NaN metrics - they are never found by a query.
+    """
+
+    METRICS = ('max_thick', 'max_thick_x', 'max_camb', 'max_camb_x', 'le_radius', 'te_gap', 'nPanels')
+
+    SHAPE_METRICS = ('max_thick', 'max_thick_x', 'max_camb', 'max_camb_x')     # for 'nearest_to'
+
+    default : 'Airfoil_Library | None' = None           # opt-in library for the airfoil widgets
+
+
+    def __init__(self, indexFile : str | None = None):
+        """
+        Args:
+            indexFile: optional - path of the index file - will be loaded if existing
+        """
+
+        self._indexFile = indexFile
+        self._entries   = {}                    # pathFileName: (name, mtime_ns, size, metrics)
+        self._arrays    = None                  # paths and metrics as arrays for queries
+        self._directories = {}                  # scanned directory: recursive
+
+        if indexFile and os.path.isfile (indexFile):
+            self.load ()
+
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} '{self._indexFile}' airfoils:{len(self)}>"
+
+    def __len__ (self) -> int:
+        return len (self._entries)
+
+    def __contains__ (self, pathFileName : str) -> bool:
+        return self._key (pathFileName) in self._entries
+
+
+    @classmethod
+    def set_default (cls, indexFile : str | None):
+        """
+        Activate library with indexFile for the airfoil widgets - None deactivates
+        """
+        cls.default = Airfoil_Library (indexFile) if indexFile else None
+
+
+    @property
+    def indexFile (self) -> str | None:
+        """ path of the index file"""
+        return self._indexFile
+
+    @property
+    def pathFileNames (self) -> list[str]:
+        """ all airfoil files of library"""
+        return list (self._entries.keys())
+
+    @property
+    def directories (self) -> list[str]:
+        """ directories scanned into library"""
+        return list (self._directories.keys())
+
+
+    def _key (self, pathFileName : str) -> str:
+        """ key of a file in the index - the absolute path"""
+        return os.path.normpath (os.path.abspath (pathFileName))
+
+
+    def _as_arrays (self) -> tuple[np.ndarray, np.ndarray]:
+        """ paths and metrics (n, len(METRICS)) of all entries for vectorized queries"""
+
+        if self._arrays is None:
+            paths   = np.array (list (self._entries.keys()), dtype=str)
+            metrics = np.array ([entry[3] for entry in self._entries.values()], dtype=float)
+            self._arrays = (paths, metrics.reshape (len(paths), len(self.METRICS)))
+        return self._arrays
+
+
+    # --- scan ---------------------------------------------------------
+
+
+    @staticmethod
+    def _airfoil_metrics (airfoil : Airfoil) -> tuple:
+        """ metrics of a loaded airfoil in the order of METRICS"""
+
+        geo = airfoil.geo
+        metrics = (geo.max_thick, geo.max_thick_x, geo.max_camb, geo.max_camb_x,
+                   geo.le_radius, geo.te_gap, geo.nPanels)
+        return tuple (float(m) for m in metrics)
+
+
+    def _metrics_of (self, pathFileName : str) -> tuple[str, tuple]:
+        """ name and metrics of airfoil file - NaN metrics if the file couldn't be loaded"""
+
+        try:
+            airfoil = Airfoil (pathFileName=pathFileName, geometry=GEO_BASIC)
+            airfoil.load ()
+            airfoil.normalize (just_basic=True)
+            return airfoil.name, self._airfoil_metrics (airfoil)
+        except Exception as e:
+            logger.warning (f"Airfoil '{pathFileName}' couldn't be added to library: {e}")
+            return os.path.basename (pathFileName), (np.nan,) * len(self.METRICS)
+
+
+    def scan (self, directory : str, recursive : bool = True) -> tuple[int, int, int]:
+        """
+        Add new and update changed .dat files of directory - remove entries of deleted files
+
+        Args:
+            directory: directory with airfoil files
+            recursive: include sub directories
+        Returns:
+            number of calculated, unchanged and removed files
+        """
+
+        directory = self._key (directory)
+        self._directories [directory] = recursive
+        n_calc, n_unchanged = 0, 0
+        found = set()
+
+        for dirPath, dirNames, fileNames in os.walk (directory):
+
+            if not recursive: dirNames.clear()
+
+            for fileName in fnmatch.filter (fileNames, '*.dat'):
+
+                pathFileName = os.path.join (dirPath, fileName)
+                try:
+                    stat = os.stat (pathFileName)
+                except OSError:
+                    continue
+                found.add (pathFileName)
+
+                entry = self._entries.get (pathFileName)
+                if entry and entry[1] == stat.st_mtime_ns and entry[2] == stat.st_size:
+                    n_unchanged += 1
+                else:
+                    name, metrics = self._metrics_of (pathFileName)
+                    self._entries [pathFileName] = (name, stat.st_mtime_ns, stat.st_size, metrics)
+                    n_calc += 1
+
+        # remove deleted files of directory
+
+        prefix = os.path.join (directory, '')
+        removed = [p for p in self._entries if p.startswith (prefix) and p not in found]
+        if not recursive:
+            removed = [p for p in removed if os.path.dirname (p) == directory]
+        for pathFileName in removed:
+            del self._entries [pathFileName]
+
+        if n_calc or removed:
+            self._arrays = None
+
+        logger.info (f"{self} scanned '{directory}': {n_calc} calculated, {n_unchanged} unchanged, {len(removed)} removed")
+
+        return n_calc, n_unchanged, len(removed)
+
+
+    def rescan (self) -> tuple[int, int, int]:
+        """
+        Scan again all directories of library - directories which don't exist anymore are removed
+
+        Returns:
+            number of calculated, unchanged and removed files
+        """
+
+        n_calc, n_unchanged, n_removed = 0, 0, 0
+
+        for directory, recursive in list (self._directories.items()):
+            if os.path.isdir (directory):
+                n = self.scan (directory, recursive=recursive)
+            else:
+                del self._directories [directory]
+                prefix  = os.path.join (directory, '')
+                removed = [p for p in self._entries if p.startswith (prefix)]
+                for pathFileName in removed:
+                    del self._entries [pathFileName]
+                self._arrays = None
+                n = (0, 0, len(removed))
+            n_calc, n_unchanged, n_removed = n_calc + n[0], n_unchanged + n[1], n_removed + n[2]
+
+        return n_calc, n_unchanged, n_removed
+
+
+    # --- persistence ----------------------------------------------------
+
+
+    def save (self, indexFile : str | None = None):
+        """
+        Save index to indexFile or the current index file - written atomically
+        """
+
+        if indexFile:
+            self._indexFile = indexFile
+        if not self._indexFile:
+            raise ValueError ("No index file defined for airfoil library")
+
+        entries = list (self._entries.items())
+        paths, metrics = self._as_arrays ()
+
+        tmp_file = f"{self._indexFile}.{os.getpid()}.tmp"
+        with open (tmp_file, 'wb') as f:
+            np.savez_compressed (f, paths   = paths,
+                                    names   = np.array ([entry[0] for _, entry in entries], dtype=str),
+                                    mtime   = np.array ([entry[1] for _, entry in entries], dtype=np.int64),
+                                    size    = np.array ([entry[2] for _, entry in entries], dtype=np.int64),
+                                    metrics = metrics,
+                                    columns = np.array (self.METRICS, dtype=str),
+                                    directories = np.array (list (self._directories.keys()), dtype=str),
+                                    recursive   = np.array (list (self._directories.values()), dtype=bool))
+        os.replace (tmp_file, self._indexFile)
+
+
+    def load (self):
+        """
+        Load index from index file - an index with different metrics is ignored
+        """
+
+        self._entries = {}
+        self._arrays  = None
+        self._directories = {}
+
+        try:
+            with np.load (self._indexFile, allow_pickle=False) as data:
+                if tuple (data['columns']) != self.METRICS:
+                    logger.warning (f"Index '{self._indexFile}' has different metrics - ignored")
+                    return
+                paths, metrics = data['paths'], data['metrics']
+                for path, name, mtime, size, m in zip (paths.tolist(), data['names'].tolist(),
+                                                       data['mtime'].tolist(), data['size'].tolist(),
+                                                       metrics.tolist()):
+                    self._entries [path] = (name, mtime, size, tuple(m))
+                if 'directories' in data.files:                      # not in older index files
+                    self._directories = dict (zip (data['directories'].tolist(), data['recursive'].tolist()))
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning (f"Index '{self._indexFile}' couldn't be loaded: {e}")
+            self._entries = {}
+            self._directories = {}
+            return
+
+        self._arrays = (paths, metrics.reshape (len(paths), len(self.METRICS)))
+
+
+    # --- queries --------------------------------------------------------
+
+
+    def name_of (self, pathFileName : str) -> str | None:
+        """ airfoil name of a file in the library"""
+
+        entry = self._entries.get (self._key (pathFileName))
+        return entry[0] if entry else None
+
+
+    def metrics_of (self, pathFileName : str) -> dict | None:
+        """ metrics of a file in the library as dict - None if not in library"""
+
+        entry = self._entries.get (self._key (pathFileName))
+        return dict (zip (self.METRICS, entry[3])) if entry else None
+
+
+    def description_of (self, pathFileName : str) -> str | None:
+        """ short description of thickness and camber e.g. for tool tips"""
+
+        m = self.metrics_of (pathFileName)
+        if m is None or np.isnan (m['max_thick']):
+            return None
+        return (f"Thickness {m['max_thick']:.2%} at {m['max_thick_x']:.1%}, " +
+                f"camber {m['max_camb']:.2%} at {m['max_camb_x']:.1%}, " +
+                f"LE radius {m['le_radius']:.2%}, {int(m['nPanels'])} panels")
+
+
+    def filter (self, **ranges) -> list[str]:
+        """
+        Airfoil files having all metrics in the given ranges
+
+        Args:
+            ranges: metric=(min, max) - min or max may be None
+                    e.g. max_thick=(0.115, 0.125), max_camb_x=(0.35, 0.40)
+        Returns:
+            sorted list of pathFileNames
+        """
+
+        paths, metrics = self._as_arrays ()
+        mask = np.ones (len(paths), dtype=bool)
+
+        for metric, (min_val, max_val) in ranges.items():
+            values = metrics [:, self._column (metric)]
+            if min_val is not None: mask &= values >= min_val
+            if max_val is not None: mask &= values <= max_val
+
+        return sorted (paths[mask].tolist(), key=str.casefold)
+
+
+    def nearest (self, n : int = 10, weights : dict | None = None, **targets) -> list[tuple[str, float]]:
+        """
+        The n airfoil files closest to the target metrics
+
+        The distance of each metric is scaled by its standard deviation in the library.
+
+        Args:
+            n: number of results
+            weights: optional - dict of metric: weight
+            targets: metric=value e.g. max_thick=0.12, max_camb=0.02
+        Returns:
+            list of (pathFileName, distance) with increasing distance
+        """
+
+        paths, metrics = self._as_arrays ()
+        if not targets or not len(paths): return []
+
+        dist2 = np.zeros (len(paths))
+        for metric, target in targets.items():
+            values = metrics [:, self._column (metric)]
+            scale  = np.nanstd (values) if np.any (~np.isnan (values)) else 0.0
+            scale  = scale if scale > 0.0 else 1.0
+            weight = weights.get (metric, 1.0) if weights else 1.0
+            dist2 += weight * ((values - target) / scale) ** 2
+
+        dist2 = np.where (np.isnan (dist2), np.inf, dist2)
+
+        n = min (n, len(paths))
+        best = np.argpartition (dist2, n-1)[:n]
+        best = best [np.argsort (dist2 [best], kind='stable')]
+
+        return [(str (paths[i]), float (np.sqrt (dist2[i]))) for i in best if np.isfinite (dist2[i])]
+
+
+    def nearest_to (self, airfoil : Airfoil, n : int = 10, weights : dict | None = None) -> list[tuple[str, float]]:
+        """
+        The n airfoil files closest to airfoil in thickness and camber (SHAPE_METRICS)
+
+        The metrics of the library are taken if airfoil is in the library - airfoil itself
+        isn't part of the result.
+
+        Args:
+            airfoil: a loaded airfoil 
+            n: number of results
+            weights: optional - dict of metric: weight
+        Returns:
+            list of (pathFileName, distance) with increasing distance
+        """
+
+        pathFileName = None
+        if airfoil.pathFileName:
+            pathFileName = self._key (os.path.join (airfoil.workingDir, airfoil.pathFileName))
+
+        metrics = self.metrics_of (pathFileName) if pathFileName else None
+        if metrics is None:
+            metrics = dict (zip (self.METRICS, self._airfoil_metrics (airfoil)))
+
+        targets = {metric: metrics [metric] for metric in self.SHAPE_METRICS}
+        nearest = self.nearest (n=n+1, weights=weights, **targets)
+
+        return [(p, dist) for p, dist in nearest if p != pathFileName][:n]
+
+
+    def _column (self, metric : str) -> int:
+        """ column index of metric"""
+
+        try:
+            return self.METRICS.index (metric)
+        except ValueError:
+            raise ValueError (f"Unknown airfoil metric '{metric}' - use one of {self.METRICS}")
+
+
+
+# Main program to build or update an index headless - run in modules: python -m model.airfoil_library
+if __name__ == "__main__":
+
+    import argparse
+
+    logging.basicConfig (level=logging.WARNING, format='%(message)s')
+
+    parser = argparse.ArgumentParser (description="Build or update an airfoil library index")
+    parser.add_argument ("index",       help="index file (.npz)")
+    parser.add_argument ("directories", help="directories with .dat files - rescan of library if omitted", nargs='*')
+    args = parser.parse_args()
+
+    library = Airfoil_Library (args.index)
+    for directory in args.directories:
+        n_calc, n_unchanged, n_removed = library.scan (directory)
+        print (f"{directory}: {n_calc} calculated, {n_unchanged} unchanged, {n_removed} removed")
+    if not args.directories:
+        n_calc, n_unchanged, n_removed = library.rescan ()
+        print (f"rescan: {n_calc} calculated, {n_unchanged} unchanged, {n_removed} removed")
+    library.save ()
+    print (library)
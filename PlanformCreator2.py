@@ -26,7 +26,9 @@ sys.path.insert (1,os.path.join(Path(__file__).parent , 'AirfoilEditor_subtree/m
 # local modules
 sys.path.insert (1,os.path.join(Path(__file__).parent , 'modules'))
 
-from wing                   import Wing
+from wing                   import Wing, WingSections
+from model.airfoil          import Airfoil
+from model.airfoil_library  import Airfoil_Library
 
 from base.common_utils      import * 
 from base.panels            import Container_Panel, MessageBox
@@ -256,6 +258,24 @@ class App_Main (QMainWindow):
 
         Settings.belongTo (__file__, nameExtension=None, fileExtension= '.settings')
 
+        # optional directory to persist strak results 
+
+        blend_cache_dir = Settings().get('blend_cache_dir', None)
+        if blend_cache_dir: 
+            WingSections.BLEND_CACHE.set_directory (blend_cache_dir)
+
+        # optional directory of binary copies of parsed airfoil files 
+
+        airfoil_cache_dir = Settings().get('airfoil_cache_dir', None)
+        if airfoil_cache_dir: 
+            Airfoil.set_file_cache (airfoil_cache_dir)
+
+        # optional airfoil library index for airfoil selection 
+
+        airfoil_library = Settings().get('airfoil_library', None)
+        if airfoil_library: 
+            Airfoil_Library.set_default (airfoil_library)
+
         # get initial window size from settings
 
         geometry = Settings().get('window_geometry', [])
@@ -635,10 +635,13 @@ class Panelling_Artist (Abstract_Artist_Planform):
 
         for line in planform.c_diff_lines ():
 
-            x, y = line[0], line[1]
+            x = [line['x'], line['x']]
             color = COLOR_WARNING # .darker(50)
             color.setAlphaF (0.5)
-            self._plot_dataItem  (x, y, pen=pg.mkPen(color, width=6), name="Chord difference", antialias=False, zValue=1)        
+
+            # line between both at le and at te 
+            for y in ([line['le_y_parent'], line['le_y']], [line['te_y_parent'], line['te_y']]):
+                self._plot_dataItem  (x, y, pen=pg.mkPen(color, width=6), name="Chord difference", antialias=False, zValue=1)        
 
 
 
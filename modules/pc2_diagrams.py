@@ -1375,9 +1375,6 @@ class Diagram_Panels (Diagram_Abstract):
 
         if self._section_panel is None:   
 
-            # do an initial calculation of panels to get the chord difference value 
-            self.planform_paneled().c_diff_lines()
-
             l = QGridLayout()   
             r,c = 0, 0 
             FieldI      (l,r,c, width=70, lab="No of X-Panels", step=1, lim=(4, 50),
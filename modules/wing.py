@@ -23,8 +23,12 @@
 import os
 import numpy as np
 import bisect
+import heapq
 import sys
 import copy
+import hashlib
+import multiprocessing
+from concurrent.futures     import ProcessPoolExecutor
 from typing                 import override
 from pathlib                import Path
 
@@ -34,6 +38,7 @@ sys.path.append(Path(__file__).parent)
 from base.common_utils      import * 
 from base.math_util         import * 
 from base.spline            import Bezier
+from base.cache_util        import LRU_Cache
 from model.airfoil          import Airfoil, GEO_BASIC, GEO_SPLINE
 from model.airfoil_examples import Root_Example, Tip_Example
 
@@ -566,6 +571,8 @@ class N_Chord_Reference:
         self._cr_bezier  : Bezier = Bezier (px, py)
         self._cr_bezier_u = np.linspace(0.0, 1.0, num=20)                     # default Bezier u parameter (for polyline)
 
+        self._version = 0                                                     # modification counter
+
 
     def _as_dict (self) -> dict:
         """ returns a data dict with the paramters of self"""
@@ -576,6 +583,11 @@ class N_Chord_Reference:
         return d
 
 
+    @property
+    def version (self) -> int:
+        """ modification counter of self - incremented by every setter"""
+        return self._version
+
     @property 
     def cr_root (self) -> float:
         """ cr value at root - typically 0.75"""
@@ -585,6 +597,7 @@ class N_Chord_Reference:
         px, _ = self._cr_bezier.points[0]
         py    = np.clip (aVal, 0.0, 1.0)
         self._cr_bezier.set_point (0, px, py)
+        self._version += 1
 
     @property 
     def cr_tip (self) -> float:
@@ -595,6 +608,7 @@ class N_Chord_Reference:
         px, _ = self._cr_bezier.points[-1]
         py    = np.clip (aVal, 0.0, 1.0)
         self._cr_bezier.set_point (-1, px, py)
+        self._version += 1
 
 
 
@@ -666,6 +680,7 @@ class N_Chord_Reference:
 
         # update bezier 
         self._cr_bezier.set_points (px, py)
+        self._version += 1
 
 
 
@@ -714,6 +729,8 @@ class N_Reference_Line:
         self._ref_bezier  : Bezier = Bezier (px, py)
         self._ref_bezier_u = np.linspace(0.0, 1.0, num=20)             # default Bezier u parameter (for polyline)
 
+        self._version = 0                                              # modification counter
+
 
     def _as_dict (self) -> dict:
         """ returns a data dict with the paramters of self"""
@@ -725,6 +742,12 @@ class N_Reference_Line:
         return d
 
 
+    @property
+    def version (self) -> int:
+        """ modification counter of self - incremented by every setter"""
+        return self._version
+
+
     def at (self, xn: float | np.ndarray, fast=True) -> float:
         """ 
         reference line yn at xn  (noramlly = 0.0 except if Banana-Bezier)
@@ -735,12 +758,12 @@ class N_Reference_Line:
                 return 0.0 
             else: 
                 return self._ref_bezier.eval_y_on_x (xn, fast=fast) 
-        else: 
-            yn = np.zeros (len(xn))
+        else:
             if self.is_banana:
-                for i in range (len(xn)):
-                    yn[i] = self.at (xn[i], fast=fast)
-            return yn
+                # evaluate banana Bezier for all xn at once (vectorized inversion)
+                return self._ref_bezier.eval_y_on_x (np.asarray (xn, dtype=float), fast=fast)
+            else:
+                return np.zeros (len(xn))
 
 
 
@@ -797,6 +820,8 @@ class N_Reference_Line:
             points.insert (1, (px_new, py_new))
             self._ref_bezier.set_points (points)
 
+        self._version += 1
+
 
     def polyline (self) -> tuple [Array, Array]:
         """
@@ -859,6 +884,7 @@ class N_Reference_Line:
 
         # update bezier 
         self._ref_bezier.set_points (px, py)
+        self._version += 1
 
         # remain in no_banana if banana point wasn't moved
         if set_no_banana:
@@ -896,6 +922,10 @@ class N_Distrib_Abstract:
             dataDict: the initial dataDict for self 
         """
 
+        self._version = 0                                               # modification counter
+        self._knots   = None                                            # polyline for interpolation ...
+        self._knots_version = None                                      #    ... of this version
+
         logger.info (str(self)  + ' created')
 
 
@@ -911,6 +941,15 @@ class N_Distrib_Abstract:
         return d
 
 
+    @property
+    def version (self) -> int | tuple:
+        """ 
+        modification counter of self - incremented by every setter
+            distributions based on wing sections include the version of the sections 
+        """
+        return self._version
+
+
     def transform_norm (self, xn : float|Array|list, yn : float|Array|list) -> ...:
         """ 
         Transforms normalized coordinates into self coordinates
@@ -943,6 +982,52 @@ class N_Distrib_Abstract:
         return self.at (1.0)
 
 
+    def _get_knots (self, polyline_fn) -> tuple:
+        """ 
+        knots of a polyline based distribution for interpolation - cached for the version of self 
+
+        Args:
+            polyline_fn: function returning xn, cn of the polyline 
+        Returns:
+            xn, cn: read only arrays of polyline
+            xn_list, cn_list: the polyline as lists for scalar lookup with bisect
+            cn_rev_list, xn_rev_list: reversed polyline with increasing cn for xn_at 
+        """
+
+        version = self.version
+        if version != self._knots_version:
+            xn, cn = polyline_fn ()
+            xn.flags.writeable = False
+            cn.flags.writeable = False
+            xn_list, cn_list = xn.tolist(), cn.tolist()
+            self._knots = (xn, cn, xn_list, cn_list, cn_list[::-1], xn_list[::-1])
+            self._knots_version = version
+        return self._knots
+
+    def _at_knots (self, xn: float|Array, polyline_fn) -> float|Array:
+        """ cn at xn by linear interpolation in the knots of polyline"""
+
+        xn_arr, cn_arr, xn_list, cn_list, _, _ = self._get_knots (polyline_fn)
+
+        if isinstance (xn, (float, int)):
+            cn = interpolate_sorted (xn_list, cn_list, xn)              # bisect 
+        else:
+            cn = np.interp(xn, xn_arr, cn_arr)                          # linear interpolation in polyline
+        return np.round (cn,10) 
+
+    def _xn_at_knots (self, cn: float|Array, polyline_fn) -> float|Array:
+        """ xn at cn by linear interpolation in the knots of polyline"""
+
+        xn_arr, cn_arr, _, _, cn_rev_list, xn_rev_list = self._get_knots (polyline_fn)
+
+        if isinstance (cn, (float, int)):
+            xn = interpolate_sorted (cn_rev_list, xn_rev_list, cn)      # bisect 
+        else:
+            # as cn is decreasing along xn the array must be reversed to use np.interp
+            xn = np.interp(cn, np.flip (cn_arr), np.flip (xn_arr))     
+        return np.round (xn,10) 
+
+
     def polyline (self) -> Polyline:
         """ 
         Normalized polyline of chord along xn
@@ -1016,7 +1101,7 @@ class N_Distrib_Bezier (N_Distrib_Abstract):
             Higher Precision is achieved with interpolation of the curve (fast=False) 
         """
 
-        return round (self._bezier.eval_y_on_x (xn, fast=fast),10) 
+        return np.round (self._bezier.eval_y_on_x (xn, fast=fast),10) 
 
 
     def xn_at (self, cn: float, fast=True) -> float:
@@ -1026,7 +1111,7 @@ class N_Distrib_Bezier (N_Distrib_Abstract):
             Higher Precision is achieved with interpolation of the curve (fast=False) 
         """
 
-        return round (self._bezier.eval_x_on_y (cn, fast=fast), 10)
+        return np.round (self._bezier.eval_x_on_y (cn, fast=fast), 10)
 
 
     def polyline (self) -> Polyline:
@@ -1090,6 +1175,7 @@ class N_Distrib_Bezier (N_Distrib_Abstract):
             py.append(jpoint_trans.y)
 
         self._bezier.set_points (px, py)
+        self._version += 1
 
 
 
@@ -1124,15 +1210,28 @@ class N_Distrib_Trapezoid (N_Distrib_Abstract):
         super().__init__ ()
 
 
+    @override
+    @property
+    def version (self) -> tuple:
+        """ modification counter of self including the wing sections defining the chord"""
+        return (self._version, self._planform.wingSections.version)
+
+
     def polyline (self) -> Polyline:
         """ 
-        Normalized polyline of chord along xn
+        Normalized polyline of chord along xn - cached for the version of self 
             At root it is: cn [0] = 1.0 
 
         Returns:
             xn: normalized x coordinates
             cn: normalized chord
         """
+        xn, cn, *_ = self._get_knots (self._polyline_of_sections)
+        return xn, cn
+
+
+    def _polyline_of_sections (self) -> Polyline:
+        """ polyline of the wing sections which define the chord"""
 
         # get the sections which define the chord 
 
@@ -1155,26 +1254,14 @@ class N_Distrib_Trapezoid (N_Distrib_Abstract):
         """ 
         Main chord function - returns cn at xn
         """
-
-        xn_arr, cn_arr = self.polyline()
-        cn = np.interp(xn, xn_arr, cn_arr)                      # linear interpolation in polyline
-
-        return round (cn,10) 
+        return self._at_knots (xn, self._polyline_of_sections)
 
 
     def xn_at (self, cn: float, fast=True) -> float:
         """ 
         returns xn at normed chord cn
         """
-        xn_arr, cn_arr = self.polyline()
-
-        # as cn is decreasing along xn the array must be reversed to use np.interp
-        xn_arr = np.flip (xn_arr)
-        cn_arr = np.flip (cn_arr)
-
-        xn = np.interp(cn, cn_arr, xn_arr)                      # linear interpolation in polyline
-
-        return round (xn,10) 
+        return self._xn_at_knots (cn, self._polyline_of_sections)
 
 
 
@@ -1213,6 +1300,16 @@ class N_Distrib_Paneled (N_Distrib_Abstract):
         super().__init__ ()
 
 
+    @override
+    @property
+    def version (self) -> tuple:
+        """ modification counter of self including the wing sections and chord of parent"""
+
+        parent_distrib = self._parent_planform.n_distrib
+        parent_version = parent_distrib.version if parent_distrib is not self else 0
+        return (self._version, self._parent_planform.wingSections.version, parent_version)
+
+
     @property
     def cn_tip_min (self) -> float: 
         """ the minimum normed chord at tip (will cut the tip)""" 
@@ -1230,6 +1327,7 @@ class N_Distrib_Paneled (N_Distrib_Abstract):
         cn_min = self._parent_planform.wingSections[-1].cn                 # cn of tip 
         cn_max = self._parent_planform.wingSections[1].cn                  # cn of 2nd section to ensure at least 2 sections
         self._cn_tip_min =  np.clip (aVal, cn_min, cn_max)
+        self._version += 1
 
     @property
     def is_cn_tip_min_applied (self) -> bool:
@@ -1239,13 +1337,19 @@ class N_Distrib_Paneled (N_Distrib_Abstract):
 
     def polyline (self) -> Polyline:
         """ 
-        Normalized polyline of chord along xn
+        Normalized polyline of chord along xn - cached for the version of self 
             At root it is: cn [0] = 1.0 
 
         Returns:
             xn: normalized x coordinates
             cn: normalized chord
         """
+        xn, cn, *_ = self._get_knots (self._polyline_of_sections)
+        return xn, cn
+
+
+    def _polyline_of_sections (self) -> Polyline:
+        """ polyline of the parent wing sections - sections below cn_tip_min are skipped"""
 
         self._is_cn_tip_min_applied = False
         cn_tip_min = self.cn_tip_min
@@ -1268,26 +1372,14 @@ class N_Distrib_Paneled (N_Distrib_Abstract):
         """ 
         Main chord function - returns cn at xn
         """
-
-        xn_arr, cn_arr = self.polyline()
-        cn = np.interp(xn, xn_arr, cn_arr)                      # linear interpolation in polyline
-
-        return round (cn,10) 
+        return self._at_knots (xn, self._polyline_of_sections)
 
 
     def xn_at (self, cn: float, fast=True) -> float:
         """ 
         returns xn at normed chord cn
         """
-        xn_arr, cn_arr = self.polyline()
-
-        # as cn is decreasing along xn the array must be reversed to use np.interp
-        xn_arr = np.flip (xn_arr)
-        cn_arr = np.flip (cn_arr)
-
-        xn = np.interp(cn, cn_arr, xn_arr)                      # linear interpolation in polyline
-
-        return round (xn,10) 
+        return self._xn_at_knots (cn, self._polyline_of_sections)
 
 
 
@@ -1309,7 +1401,7 @@ class N_Distrib_Elliptical (N_Distrib_Abstract):
         """
 
         cn = np.sqrt(1.0 - (xn ** 2))                       # Pythagoras
-        return round (cn,10) 
+        return np.round (cn,10) 
 
 
     def xn_at (self, cn: float, fast=True) -> float:
@@ -1317,7 +1409,7 @@ class N_Distrib_Elliptical (N_Distrib_Abstract):
         returns xn at normed chord cn
         """
         xn = np.sqrt(1.0 - (cn ** 2))                       # Pythagoras
-        return round (xn,10) 
+        return np.round (xn,10) 
 
 
     def polyline (self) -> Polyline:
@@ -1525,7 +1617,7 @@ class WingSection :
         xn position of self. If self is based on cn, the position will be evaluated from the planform
         """
         if self._xn is None:
-            return self._planform.xn_at_cn (self.cn, fast=False)
+            return self._planform.wingSections.xn_cn_of (self)[0]
         else: 
             return self._xn
         
@@ -1546,6 +1638,8 @@ class WingSection :
             if self._xn is None: self._xn = round(self.xn,10)           
             if self._cn is None: self._cn = round(self.cn,10) 
 
+        self._planform.wingSections._changed()
+
     @property
     def x (self) -> float:
         """
@@ -1564,7 +1658,7 @@ class WingSection :
         chord cn of self. If self is based on xn, the chord will be evaluated from the planform
         """
         if self._cn is None:
-            return self._planform.cn_at (self.xn, fast=False, normed=True)
+            return self._planform.wingSections.xn_cn_of (self)[1]
         else: 
             return self._cn
 
@@ -1586,6 +1680,8 @@ class WingSection :
             if self._xn is None: self._xn = round(self.xn,10)           
             if self._cn is None: self._cn = round(self.cn,10) 
 
+        self._planform.wingSections._changed()
+
     @property
     def c (self) -> float:
         """
@@ -1630,6 +1726,7 @@ class WingSection :
                     self.set_cn (self.cn)
                 else: 
                     self.set_cn (None)       
+                self._planform.wingSections._changed()
         return True
 
     @property
@@ -1713,6 +1810,7 @@ class WingSection :
         if not self.hinge_equal_ref_line:
             aVal = np.clip (aVal, 0.0, 1.0)
             self._hinge_cn = round (aVal,10) 
+            self._planform.wingSections._changed()
 
 
     @property
@@ -1756,12 +1854,14 @@ class WingSection :
             self.set_hinge_cn (self.hinge_cn)                           # will calculate the actual value
         else: 
             self._hinge_cn = None
+            self._planform.wingSections._changed()
 
 
     def hinge_remove (self):
         """ remove a individual hinge position of self"""
         if not self.hinge_equal_ref_line:
             self._hinge_cn = None
+            self._planform.wingSections._changed()
 
 
     @property
@@ -1771,6 +1871,7 @@ class WingSection :
 
     def set_flap_group (self, aGroup : int):
         self._flap_group = aGroup 
+        self._planform.wingSections._changed()
 
 
     @property
@@ -1827,6 +1928,131 @@ class WingSection :
 
 
 
+class Blend_Cache:
+    """ 
+    Content addressed cache of blend results of strak 
+
+    The key is a hash of the coordinates and geometry classes of both parent airfoils, 
+    the rounded blendBy and the geometry class of the blend. 
+    Results are kept in a bounded LRU memory cache and optionally as .npz files in a directory 
+    so a reopened wing design reuses earlier strak results.  
+    """
+
+    BLENDBY_DECIMALS = 8                                # rounding of blendBy in key
+
+    def __init__ (self, maxsize : int = 256, directory : str|None = None):
+        """
+        Args:
+            maxsize: max number of results in memory
+            directory: optional - directory to persist results 
+        """
+
+        self._memory    = LRU_Cache (maxsize=maxsize, name='Blend_Cache')
+        self._directory = None 
+        self.set_directory (directory)
+
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self._memory} dir: {self._directory}>"
+
+    @property
+    def memory (self) -> LRU_Cache:
+        """ the in-memory LRU cache with its statistics"""
+        return self._memory
+
+    @property
+    def directory (self) -> str|None:
+        """ directory where results are persisted - None if only in memory"""
+        return self._directory
+
+    def set_directory (self, aDir : str|None):
+        """ set directory to persist results - will be created - None for memory only"""
+        if aDir:
+            try:
+                os.makedirs (aDir, exist_ok=True)
+            except OSError as e:
+                logger.warning (f"{self} directory '{aDir}' couldn't be created: {e}")
+                aDir = None
+        self._directory = aDir if aDir else None
+
+
+    @classmethod
+    def key (cls, x1 : np.ndarray, y1 : np.ndarray, geo_class1, 
+                  x2 : np.ndarray, y2 : np.ndarray, geo_class2,
+                  blendBy : float, geometry_class) -> str:
+        """ content hash of the inputs of a blend"""
+
+        h = hashlib.sha1 ()
+        for arr in [x1, y1, x2, y2]:
+            h.update (np.ascontiguousarray (arr, dtype=np.float64).tobytes())
+        for geo_class in [geo_class1, geo_class2, geometry_class]:
+            h.update (f"{geo_class.__module__}.{geo_class.__qualname__};".encode())
+        h.update (repr(round (float(blendBy), cls.BLENDBY_DECIMALS)).encode())
+        return h.hexdigest()
+
+
+    def get (self, key : str) -> tuple [np.ndarray, np.ndarray] | None:
+        """ returns copy of x,y of blend result with key - None if not cached"""
+
+        xy = self._memory.get (key)
+
+        if xy is None and self._directory:
+            pathFileName = os.path.join (self._directory, key + '.npz')
+            if os.path.isfile (pathFileName):
+                try:
+                    with np.load (pathFileName) as data:
+                        xy = (data['x'], data['y'])
+                    self._memory.put (key, xy)
+                except Exception as e:
+                    logger.warning (f"{self} couldn't read '{pathFileName}': {e}")
+                    try:
+                        os.remove (pathFileName)                # will be written again with next put 
+                    except OSError:
+                        pass
+
+        return None if xy is None else (np.copy(xy[0]), np.copy(xy[1]))
+
+
+    def put (self, key : str, x : np.ndarray, y : np.ndarray):
+        """ stores a copy of x,y of blend result with key"""
+
+        xy = (np.array (x, dtype=np.float64), np.array (y, dtype=np.float64))
+        self._memory.put (key, xy)
+
+        if self._directory:
+            pathFileName = os.path.join (self._directory, key + '.npz')
+            if not os.path.isfile (pathFileName):
+                try:
+                    tmpFileName = pathFileName + f".{os.getpid()}.tmp"
+                    with open (tmpFileName, 'wb') as f:
+                        np.savez (f, x=xy[0], y=xy[1])
+                    os.replace (tmpFileName, pathFileName)           # atomic - no half written files 
+                except OSError as e:
+                    logger.warning (f"{self} couldn't write '{pathFileName}': {e}")
+
+
+    def clear (self):
+        """ removes all results in memory - persisted results remain"""
+        self._memory.clear()
+
+
+
+def _blend_xy (x1 : np.ndarray, y1 : np.ndarray, geo_class1, 
+               x2 : np.ndarray, y2 : np.ndarray, geo_class2, 
+               blendBy : float, geometry_class) -> tuple [np.ndarray, np.ndarray]:
+    """ 
+    worker of parallel strak - blends the coordinates of two airfoils 
+
+    Only coordinates and geometry classes are transferred to the worker process.
+    Returns x,y of the blended airfoil 
+    """
+
+    geo = geometry_class (x1, y1)
+    geo.blend (geo_class1 (x1, y1), geo_class2 (x2, y2), blendBy)
+    return geo.x, geo.y
+
+
+
 class WingSections (list):
     """ 
     container (list) for wing sections of a planform
@@ -1838,12 +2064,20 @@ class WingSections (list):
 
     """
 
+    BLEND_CACHE = Blend_Cache()                                 # blend results shared by all wings
+
     def __init__ (self, planform: 'Planform', sectionsDict: dict = {}):
         super().__init__ ([])
 
         self._planform = planform
 
         self._strak_done = False
+        self._strak_workers = 1                                 # number of worker processes for strak 
+        self._strak_inputs  = {}                                # inputs of last blend of a section  
+        self._strak_skipped = 0                                 # counter of blends skipped as inputs didn't change
+        self._version    = 0                                    # modification counter of sections
+        self._xn_cn      = {}                                   # resolved xn, cn of sections 
+        self._xn_cn_version = None                              #    ... for this planform version
 
         # create all sections based on sections list in dataDict 
         sections : list[WingSection] = []
@@ -1870,6 +2104,66 @@ class WingSections (list):
     def workingDir (self) -> str:
        """ current working directory""" 
        self._planform.workingDir 
+
+
+    @property
+    def version (self) -> int:
+        """ modification counter - incremented if a section is added, removed or changed"""
+        return self._version
+
+    def _changed (self):
+        """ a section was added, removed or changed"""
+        self._version += 1
+
+
+    def xn_cn_of (self, section : 'WingSection') -> tuple[float, float]:
+        """ 
+        xn and cn of section. 
+            Sections defined only by cn or xn are resolved from the planform in one batch 
+            for all sections. The result is kept for the current planform version. 
+        """
+
+        version = self._planform.version
+        entry   = self._xn_cn.get (section) if version == self._xn_cn_version else None
+
+        # inputs of section may be changed within a setter before the version is increased 
+        if entry is None or entry[0] != (section._xn, section._cn):
+            self._xn_cn = self._resolve_xn_cn ()
+            self._xn_cn_version = version
+            entry = self._xn_cn.get (section)
+
+        if entry is None:                                       # section not (yet) in self 
+            return self._resolve_xn_cn ([section])[section][1]
+        return entry[1]
+
+
+    def _resolve_xn_cn (self, sections : list['WingSection'] | None = None) -> dict:
+        """ 
+        resolve missing xn or cn of sections in one pass over the planform 
+
+        Returns:
+            dict section: ((_xn, _cn), (xn, cn)) with the inputs and the resolved values
+        """
+
+        sections = self if sections is None else sections
+        planform = self._planform
+        section : WingSection
+
+        by_cn = [section for section in sections if section._xn is None]
+        by_xn = [section for section in sections if section._cn is None]
+
+        # scalar evaluation as the distribution memoizes single values - so only 
+        #   a modified section has to be evaluated again 
+
+        xn_of = {section : planform.xn_at_cn (section._cn, fast=False) for section in by_cn}
+        cn_of = {section : planform.cn_at (section._xn, fast=False, normed=True) for section in by_xn}
+
+        table = {}
+        for section in sections:
+            xn = xn_of [section] if section._xn is None else section._xn
+            cn = cn_of [section] if section._cn is None else section._cn
+            table [section] = ((section._xn, section._cn), (xn, cn))
+        return table
    
 
     def _as_list_of_dict (self) -> list[dict]:
@@ -1882,11 +2176,13 @@ class WingSections (list):
         return section_list
 
 
-    def create_after (self, aSection: 'WingSection'=None, index=None) -> 'WingSection' : 
+    def create_after (self, aSection: 'WingSection'=None, index=None, cn : float = None) -> 'WingSection' : 
         """
         creates and inserts a new wing section after aSection 
             with a chord in the middle to the next neighbour 
 
+        Args:
+            cn: optional chord of the new section instead of the middle 
         Return: 
             newSection: the new wingSection
         """
@@ -1900,11 +2196,12 @@ class WingSections (list):
 
             _, right_sec = self.neighbours_of (aSection)
 
-            new_cn = (aSection.cn + right_sec.cn) / 2
+            new_cn = (aSection.cn + right_sec.cn) / 2 if cn is None else cn
             new_flap_group = aSection.flap_group 
 
             new_section = WingSection (self._planform, {"cn": new_cn, "flap_group":new_flap_group})
             self.insert (self.index(aSection) + 1, new_section)
+            self._changed()
 
         return new_section
 
@@ -1934,6 +2231,7 @@ class WingSections (list):
         new_section = WingSection (self._planform, {"xn": xn})
         self.insert (1,new_section)                                     # insert section somewhere
         self.sort_by_xn ()                                               # and bring it in order 
+        self._changed()
 
         # set flap group of new to the left neighbour 
         left_sec, _ = self.neighbours_of (new_section) 
@@ -1949,13 +2247,14 @@ class WingSections (list):
             try:
                 index = self.index (aSection)
                 self.remove (aSection)
+                self._changed()
                 return self[index-1] 
             except: 
                 pass
         return None  
 
 
-    def do_strak (self, geometry_class  = None): 
+    def do_strak (self, geometry_class  = None, workers : int|None = None): 
         """
         straks the airfoil of all wing sections having a Strak-Airfoil which is 
         created by blending with its real neighbours
@@ -1963,25 +2262,146 @@ class WingSections (list):
         Args: 
             geometry: optional - the desired geometry of the new straked airfoils 
                                  either GEO_BASIC or GEO_SPLINE
+            workers: optional - number of worker processes - default is 'strak_workers'
+                                 with more than 1 worker the blends are done in a process pool 
+
+        A section is only blended again if its inputs changed since the last strak 
         """
         section: WingSection
 
+        # collect blends - neighbours are real airfoils, so the blends are independant  
+
+        blends = []
+        last_inputs = self._strak_inputs
+        self._strak_inputs = {}                                 # forget removed sections 
+
         for section in self:
             if section.airfoil.isBlendAirfoil: 
 
                 # get the neighbour wing sections  with real airfoils 
 
                 left_sec, right_sec = self.neighbours_having_airfoil(section) 
-                cn = left_sec.cn
                 blendBy  = (section.cn - left_sec.cn) / (right_sec.cn - left_sec.cn)
 
-                # strak - set new geometry to achieve higher quality with splined airfoils 
+                inputs = self._strak_inputs_of (section, left_sec, right_sec, blendBy, geometry_class)
+                if last_inputs.get (section) == inputs:
+                    self._strak_inputs [section] = inputs
+                    self._strak_skipped += 1
+                else: 
+                    blends.append ((section, left_sec, right_sec, blendBy))
+
+        # blend results of identical inputs are taken from cache 
+
+        jobs    = self._blend_jobs (blends, geometry_class)
+        keys    = {i : Blend_Cache.key (*args) for i, args in jobs.items()}
+        results = {}
+        for i, key in keys.items():
+            xy = self.BLEND_CACHE.get (key)
+            if xy is not None: 
+                results [i] = xy 
+        cached  = set (results)
+
+        workers = self.strak_workers if workers is None else workers
+
+        if workers > 1:
+            results.update (self._blend_in_pool ({i : args for i, args in jobs.items() if i not in cached}, workers))
+
+        for i, (section, left_sec, right_sec, blendBy) in enumerate (blends):
 
-                section.airfoil.set_name (left_sec.airfoil.name, reset_original=True)     # name will be <left_name>_blend0.6
+            # strak - set new geometry to achieve higher quality with splined airfoils 
 
+            section.airfoil.set_name (left_sec.airfoil.name, reset_original=True)     # name will be <left_name>_blend0.6
+
+            if i in results:
+                x, y = results [i]
+                section.airfoil.set_blend_result (left_sec.airfoil,  right_sec.airfoil, blendBy, x, y, geometry_class)
+            else: 
                 section.airfoil.do_blend (left_sec.airfoil,  right_sec.airfoil, blendBy, geometry_class)
 
-                self._strak_done = True 
+            if i in keys and not i in cached:
+                self.BLEND_CACHE.put (keys[i], section.airfoil.x, section.airfoil.y)
+
+            self._strak_inputs [section] = self._strak_inputs_of (section, left_sec, right_sec, blendBy, geometry_class)
+            self._strak_done = True 
+
+
+    def _strak_inputs_of (self, section : 'WingSection', left_sec : 'WingSection', right_sec : 'WingSection', 
+                          blendBy : float, geometry_class) -> tuple:
+        """
+        the inputs the blended airfoil of section depends on - the neighbour airfoils, 
+            blendBy and geometry - and the blended airfoil itself to detect outside changes
+        """
+
+        def coordinates (airfoil : Airfoil) -> tuple | None:
+            # exact, hashable copy of coordinates - a new strak airfoil has none 
+            return None if airfoil.x is None else (airfoil.x.tobytes(), airfoil.y.tobytes())
+
+        airfoil, left, right = section.airfoil, left_sec.airfoil, right_sec.airfoil
+
+        return (blendBy, geometry_class, 
+                airfoil, airfoil.name, coordinates (airfoil),
+                left,    left.name,    coordinates (left),
+                right,                 coordinates (right))
+
+
+    def _blend_jobs (self, blends : list[tuple], geometry_class) -> dict [int, tuple]:
+        """
+        the arguments of '_blend_xy' for blends which can be done just with coordinates 
+            - Bezier or Hicks-Henne based parents can't be rebuilt from x,y and are skipped
+
+        Returns:
+            dict of index in blends : arguments of '_blend_xy'
+        """
+
+        jobs = {}
+        for i, (section, left_sec, right_sec, blendBy) in enumerate (blends):
+            geo1 = left_sec.airfoil.geo
+            geo2 = right_sec.airfoil.geo
+            if (geo1.isBasic or geo1.isSplined) and (geo2.isBasic or geo2.isSplined):
+                geo_class = geometry_class if geometry_class is not None else section.airfoil.geo.__class__
+                jobs [i] = (geo1.x, geo1.y, geo1.__class__, geo2.x, geo2.y, geo2.__class__, blendBy, geo_class)
+        return jobs
+
+
+    def _blend_in_pool (self, jobs : dict [int, tuple], workers : int) -> dict [int, tuple]:
+        """
+        blends in a process pool - only coordinate arrays are transferred to the worker processes 
+
+        Args:
+            jobs: dict of index in blends : arguments of '_blend_xy' 
+        Returns:
+            dict of index in blends : x,y of blended airfoil - empty if pool failed 
+        """
+
+        if len(jobs) < 2: return {}
+
+        # 'spawn' - forking a process with running Qt threads isn't safe 
+        try:
+            with ProcessPoolExecutor (max_workers=min (workers, len(jobs)),
+                                      mp_context=multiprocessing.get_context ("spawn")) as pool:
+                futures = {i : pool.submit (_blend_xy, *args) for i, args in jobs.items()}
+                return {i : future.result() for i, future in futures.items()}
+        except Exception as e:
+            logger.warning (f"Parallel strak failed - falling back to sequential: {e}")
+            return {}
+
+
+    @property
+    def strak_skipped (self) -> int:
+        """ counter of blends skipped by strak as their inputs didn't change"""
+        return self._strak_skipped
+
+
+    @property
+    def strak_workers (self) -> int:
+        """ number of worker processes for strak - 1 is sequential"""
+        return self._strak_workers
+
+    def set_strak_workers (self, aVal : int|None):
+        """ set number of worker processes for strak - None or 0 will take number of cpu"""
+        if not aVal:
+            aVal = os.cpu_count() or 1
+        self._strak_workers = max (1, int(aVal))
 
 
     @property
@@ -1997,6 +2417,7 @@ class WingSections (list):
             they have fixed xn and chord mixed    
         """
         self.sort (key=lambda sec: sec.xn) 
+        self._changed()
 
 
     def neighbours_of (self, aSection: WingSection) -> tuple [WingSection, WingSection]:
@@ -2120,13 +2541,15 @@ class WingSections (list):
 class Flap:
     """ 
     Outline of a single flap based on flap group in the wing sections  
+        The geometry of all flaps is calculated by Flaps in one pass (see Flaps._geometry)
     """
     def __init__(self, flaps: 'Flaps',
-                 section_left: WingSection, section_right: WingSection):
+                 section_left: WingSection, section_right: WingSection, index : int = 0):
         """
         Main constructor for new flap belonging to a wing 
         """
         self._flaps = flaps
+        self._index = index                                 # row of self in flaps geometry 
 
         self.x_from = section_left.x
         self.x_to   = section_right.x
@@ -2151,34 +2574,27 @@ class Flap:
         return f"{self.flap_group}"
     
 
+    def _geo (self, x_offset=0) -> np.void:
+        """ geometry of self as a row of the flaps geometry"""
+        return self._flaps._geometry (x_offset) [self._index]
+
+
     def polygon  (self) -> tuple [Array, Array]:
         """
         polyline x,y of self    
         """
-        x,y = [], []
+        geo = self._geo ()
+        i1, i2 = geo['i_from'], geo['i_to']
 
         # we start a TE at xn_from and going clockwise around the flap upto xn_to
-        x.append(self.x_from)
-        y.append(self.planform.le_te_at (self.x_from)[1])
-
-        # go to hinge point
-        x.append(self.x_from)
-        y.append(self._flaps.hinge_y_at(self.x_from))
-
-        # go along the hinge 
-        x.append(self.x_to)
-        y.append(self._flaps.hinge_y_at(self.x_to))
-
-        # back to TE 
-        x.append(self.x_to)
-        y.append(self.planform.le_te_at (self.x_to)[1])
+        #   ... to hinge point, along the hinge, back to TE 
+        x = [geo['x_from'], geo['x_from'], geo['x_to'], geo['x_to']]
+        y = [geo['te_y_from'], geo['hinge_y_from'], geo['hinge_y_to'], geo['te_y_to']]
 
         # ... finally along TE to starting point back to TE
         x_arr, _, te_y = self.planform.le_te_polyline()
-        i1 = min(bisect.bisect(te_y, self.x_from)-1, len(te_y) -2)    # get te coordinates between xn_from and yTo
-        i2 = min(bisect.bisect(te_y, self.x_to)  -1, len(te_y) -2)
-        y = np.append (y, np.flip(te_y[i1:i2+1]))  
         x = np.append (x, np.flip(x_arr[i1:i2+1]))
+        y = np.append (y, np.flip(te_y [i1:i2+1]))  
 
         return x, y
 
@@ -2188,81 +2604,51 @@ class Flap:
         """
         polyline x, y of self left side   
         """
-        x_from = self.x_from + x_offset * self.planform.span
-        x,y = [], []
+        geo = self._geo (x_offset)
 
-        # we start a TE at xn_from and going clockwise around the flap upto xn_to
-        x.append(x_from)
-        y.append(self.planform.le_te_at (x_from)[1])
-
-        # go to hinge point
-        x.append(x_from)
-        y.append(self._flaps.hinge_y_at (x_from))
+        # from TE at x_from to hinge point
+        x = np.array ([geo['x_from'],    geo['x_from']])
+        y = np.array ([geo['te_y_from'], geo['hinge_y_from']])
 
-        return np.array(x), np.array(y)
+        return x, y
 
 
     def line_right  (self, x_offset=0) -> tuple [Array, Array]:
         """
         polyline x, y of self right side   
         """
-        x_to   = self.x_to - x_offset * self.planform.span
-        y,x = [], []
-
-        # we start a TE at xn_from and going clockwise around the flap upto xn_to
-        x.append(x_to)
-        y.append(self.planform.le_te_at (x_to)[1])
+        geo = self._geo (x_offset)
 
-        # go to hinge point
-        x.append(x_to)
-        y.append(self._flaps.hinge_y_at (x_to))
+        # from TE at x_to to hinge point
+        x = np.array ([geo['x_to'],    geo['x_to']])
+        y = np.array ([geo['te_y_to'], geo['hinge_y_to']])
 
-        return np.array(x), np.array(y)
+        return x, y
 
 
     def line_hinge  (self, x_offset=0) -> tuple [Array, Array]:
         """
         hinge line x, y line of self    
         """
-        x,y = [], []
+        geo = self._geo (x_offset)
 
-        # go to hinge point
-        x_from  = self.x_from + x_offset * self.planform.span
-        hinge_y = self._flaps.hinge_y_at (x_from)  
-        x.append(x_from)
-        y.append(hinge_y)
+        x = np.array ([geo['x_from'],       geo['x_to']])
+        y = np.array ([geo['hinge_y_from'], geo['hinge_y_to']])
 
-        # go along the hinge 
-        x_to    = self.x_to   - x_offset * self.planform.span
-        hinge_y = self._flaps.hinge_y_at (x_to)  
-        x.append(x_to)
-        y.append(hinge_y)
-
-        return np.array(x), np.array(y)
+        return x, y
 
 
     def line_te  (self, x_offset=0) -> tuple [Array, Array]:
         """
         trailing edge polyline y,x of self    
         """
-        x_from = self.x_from + x_offset * self.planform.span
-        x_to   = self.x_to   - x_offset * self.planform.span
-        y,x = [], []
-
-        # we start a TE at xn_from  
-        x.append(x_from)
-        y.append(self.planform.le_te_at (x_from)[1])
-
-        # ... along TE 
-        x_arr, _, le_y = self.planform.le_te_polyline()
-        i1 = min(bisect.bisect(x_arr, x_from)-1, len(x_arr) -2)    # get te coordinates between xn_from and yTo
-        i2 = min(bisect.bisect(x_arr, x_to)  -1, len(x_arr) -2)
-        x = np.append (x, x_arr[i1:i2+1])
-        y = np.append (y, le_y [i1:i2+1])  
+        geo = self._geo (x_offset)
+        i1, i2 = geo['i_from'], geo['i_to']
 
-        # final TE point 
-        x = np.append(x, x_to)
-        y = np.append(y, self.planform.le_te_at(x_to)[1])
+        # TE at x_from, along TE, final TE point at x_to
+        x_arr, _, te_y = self.planform.le_te_polyline()
+        x = np.concatenate (([geo['x_from']],    x_arr[i1:i2+1], [geo['x_to']]))
+        y = np.concatenate (([geo['te_y_from']], te_y [i1:i2+1], [geo['te_y_to']]))
  
         return x,y
 
@@ -2270,18 +2656,44 @@ class Flap:
     def center (self) -> tuple [float, float]:
         """ center point of self"""
 
-        x = (self.x_to + self.x_from) / 2
+        geo = self._geo ()
+        return float (geo['x_center']), float (geo['y_center']) 
 
-        te_y    = self.planform.le_te_at(x)[1]
-        hinge_y = self._flaps.hinge_y_at(x)
-        y       = (te_y + hinge_y) / 2
 
-        return x, y 
 
 
+class _Version_Cache:
+    """ 
+    Mixin to memoize derived results of an object for its current 'version' 
+        The class must provide a property 'version' which changes with every modification 
+    """
+
+    _cache_version = None                           # version of the results in _cache 
+
+    def _cached (self, key : str, calc_fn):
+        """ 
+        returns the result of calc_fn memoized for the current version of self
+            numpy arrays of the result are read only as they are shared 
+        """
+
+        version = self.version
+        if version != self._cache_version:
+            self._cache = {}
+            self._cache_version = version
+
+        try:
+            return self._cache [key]
+        except KeyError:
+            result = calc_fn ()
+            for arr in (result if isinstance (result, tuple) else (result,)):
+                if isinstance (arr, np.ndarray):
+                    arr.flags.writeable = False
+            self._cache [key] = result
+            return result
 
 
-class Flaps:
+
+class Flaps (_Version_Cache):
     """ 
     Creates dynamically list of Flaps from definitions in wingSections 
 
@@ -2291,12 +2703,20 @@ class Flaps:
                 |-- Norm_Flap
     """ 
 
+    FLAP_DTYPE = np.dtype ([('x_from', float), ('x_to', float), 
+                            ('te_y_from', float), ('te_y_to', float), 
+                            ('hinge_y_from', float), ('hinge_y_to', float),
+                            ('i_from', int), ('i_to', int),
+                            ('x_center', float), ('y_center', float)])
+
     def __init__(self, planform: 'Planform', dataDict: dict = None):
 
         self._planform : Planform = planform
 
         self._hinge_equal_ref_line = fromDict (dataDict, "hinge_equal_ref_line", False)  
 
+        self._version       = 0                     # modification counter of self
+
         self.check_and_correct ()                   # sanity checks of hinge and flap definitions    
 
 
@@ -2366,12 +2786,28 @@ class Flaps:
     
     def set_hinge_equal_ref_line (self, aBool : bool):
         self._hinge_equal_ref_line = aBool == True 
+        self._version += 1
+
+
+    @property
+    def version (self) -> tuple:
+        """ 
+        version of self - changes with every modification of self or the planform 
+            (flap group and hinge are part of the wing sections)
+        """
+        return (self._version, self._planform.version)
 
 
     def get (self) -> list[Flap]: 
         """
         returns the flap objects based on wing sections flap group
         """
+        return list (self._cached ('flaps', self._get_flaps))
+
+
+    def _get_flaps (self) -> list[Flap]: 
+        """ create the flap objects based on wing sections flap group"""
+
         flapList = []
         if not self._wingSections: return flapList 
 
@@ -2389,7 +2825,7 @@ class Flaps:
                 pass
             elif (section.flap_group != start_section.flap_group or section == self._wingSections[-1]) :
                 
-                flapList.append(Flap(self, start_section, section))
+                flapList.append(Flap(self, start_section, section, index=len(flapList)))
                 if section.flap_group > 0:
                     start_section = section 
                 else:
@@ -2398,6 +2834,56 @@ class Flaps:
         return flapList
     
 
+    def _geometry (self, x_offset : float = 0) -> np.ndarray:
+        """ 
+        geometry of all flaps of 'get' as structured array (see FLAP_DTYPE) having the fields 
+            x_from, x_to:               left and right side of flap - moved inwards by x_offset * span
+            te_y_from, te_y_to:         trailing edge at x_from, x_to 
+            hinge_y_from, hinge_y_to:   hinge line at x_from, x_to 
+            i_from, i_to:               index range of le_te_polyline between x_from and x_to
+            x_center, y_center:         center point of flap 
+        """
+        return self._cached (f'geometry_{x_offset}', lambda: self._calc_geometry (x_offset))
+
+
+    def _calc_geometry (self, x_offset : float) -> np.ndarray:
+        """ calculate the geometry of all flaps in one pass over trailing edge and hinge line"""
+
+        flaps = self.get ()
+        geo   = np.zeros (len(flaps), dtype=self.FLAP_DTYPE)
+        if not flaps: return geo
+
+        span   = self._planform.span
+        x_from = np.array ([flap.x_from for flap in flaps])
+        x_to   = np.array ([flap.x_to   for flap in flaps])
+
+        geo['x_from']   = x_from + x_offset * span
+        geo['x_to']     = x_to   - x_offset * span
+        geo['x_center'] = (x_to + x_from) / 2
+
+        # trailing edge and hinge at all sides and centers of the flaps 
+
+        n = len(flaps)
+        x = np.concatenate ((geo['x_from'], geo['x_to'], geo['x_center']))
+
+        # scalar le_te_at as the array evaluation of the chord differs in the last digits 
+        te_y = np.array ([self._planform.le_te_at (xi)[1] for xi in x.tolist()])
+        hinge_x, hinge_y = self.hinge_polyline ()
+        hinge_y = np.interp (x, hinge_x, hinge_y)                           # linear interpolation 
+
+        geo['te_y_from'],    geo['te_y_to']    = te_y    [:n], te_y    [n:2*n]
+        geo['hinge_y_from'], geo['hinge_y_to'] = hinge_y [:n], hinge_y [n:2*n]
+        geo['y_center'] = (te_y [2*n:] + hinge_y [2*n:]) / 2
+
+        # te coordinates between x_from and x_to 
+
+        x_arr, _, _ = self._planform.le_te_polyline()
+        geo['i_from'] = np.minimum (np.searchsorted (x_arr, geo['x_from'], side='right') - 1, len(x_arr) - 2)
+        geo['i_to']   = np.minimum (np.searchsorted (x_arr, geo['x_to'],   side='right') - 1, len(x_arr) - 2)
+
+        return geo
+
+
     def delete_hinge_point_ok (self, index : int) -> bool:
         """ is delete hinge point having index ok? Return True if it would be ok """
 
@@ -2472,6 +2958,11 @@ class Flaps:
         """
         hinge line x,y to the very tip   
         """
+        return self._cached ('hinge_polyline', self._hinge_polyline)
+
+
+    def _hinge_polyline  (self) -> tuple [Array, Array]:
+        """ calculate hinge line x,y to the very tip"""
 
         x, y = self._get_hinge_points ()
 
@@ -2565,17 +3056,20 @@ class Flaps:
         relative flap depth e.g. 0.27 (hinge positio) within chord reference    
         """
 
+        return self._cached ('flap_cn_polyline', self._flap_cn_polyline)
+
+
+    def _flap_cn_polyline  (self) -> tuple [Array, Array]:
+        """ calculate relative flap depth within chord reference"""
+
         # as the relative flap depth e.g. 0.27 is not a striaght line if the chord reference 
         # is defined by a curve, the relative flap depth has to be interpolated for each point 
 
         hinge_x, hinge_y = self.hinge_polyline ()
 
         x, le_y, te_y =  self._planform.le_te_polyline ()
-        rel_depth = np.zeros (len(x))
-
-        for i, xi in enumerate (x):
-            hinge_yi = np.interp(xi, hinge_x, hinge_y)                            # linear interpolation 
-            rel_depth[i] = (le_y[i] - hinge_yi) / (le_y[i] - te_y[i])
+        hinge_y   = np.interp (x, hinge_x, hinge_y)                             # linear interpolation 
+        rel_depth = (le_y - hinge_y) / (le_y - te_y)
 
         return x / self._planform.span, rel_depth
 
@@ -2584,14 +3078,17 @@ class Flaps:
         """
         flap depth in chord distribution polyline which is flap depth 0.25 * local cn  
         """
+        return self._cached ('flap_in_chord_polyline', self._flap_in_chord_polyline)
+
+
+    def _flap_in_chord_polyline  (self) -> tuple [Array, Array]:
+        """ calculate flap depth in chord distribution polyline"""
+
         hinge_x, hinge_y = self.hinge_polyline ()
 
         x, le_y, te_y =  self._planform.le_te_polyline()
-        depth = np.zeros (len(x))
-
-        for i, xi in enumerate (x):
-            hinge_yi = np.interp(xi, hinge_x, hinge_y)         # linear interpolation 
-            depth[i] = (te_y[i] - hinge_yi) / self._planform.chord_root
+        hinge_y = np.interp (x, hinge_x, hinge_y)                               # linear interpolation 
+        depth   = (te_y - hinge_y) / self._planform.chord_root
 
         return x / self._planform.span, depth
 
@@ -2678,7 +3175,7 @@ class Flaps:
 #-------------------------------------------------------------------------------
 
 
-class Planform: 
+class Planform (_Version_Cache): 
     """ 
 
     Main object representing the planform of a wing half.
@@ -2719,8 +3216,7 @@ class Planform:
         self._chord_root  = fromDict (dataDict, "chord_root", 200.0)
         self._sweep_angle = fromDict (dataDict, "sweep_angle", 1.0)
 
-        self._planform_area = None                                        # will be calculated
-        self._planform_mac  = None                                        # mean aerodynamic chord - will be calculated
+        self._version       = 0                                           # modification counter of self
 
         # create Norm_Chord distribution depending on style e.g. 'Bezier'
 
@@ -2811,6 +3307,7 @@ class Planform:
         """ set span of halfwing"""
         aVal = max ( 0.01, aVal)
         self._span = aVal 
+        self._version += 1
 
 
     @property
@@ -2825,6 +3322,7 @@ class Planform:
         """ set chord at root """
         aVal = max ( 0.01, aVal)
         self._chord_root = aVal 
+        self._version += 1
 
 
     @property
@@ -2841,26 +3339,32 @@ class Planform:
         aVal = max (-75.0, aVal)
         aVal = min ( 75.0, aVal)
         self._sweep_angle = aVal 
+        self._version += 1
+
+    @property
+    def version (self) -> tuple:
+        """ 
+        version of self - changes with every modification of self or its components 
+            (chord distribution, chord reference, reference line, wing sections)
+        """
+        version = (self._version, self.n_distrib.version, self.n_chord_ref.version, 
+                   self.n_ref_line.version, self.wingSections.version)
+        if self._is_slave:
+            version += (self.wing.planform._version,)                     # span, chord of master 
+        return version
+
 
     @property
     def planform_area (self) -> float:
         """ (approximated) planform area"""
 
-        if self._planform_area is None: 
-            # this is normally done automatically each time the le, te poyline is calculated
-            x, le_y, te_y = self.le_te_polyline ()
-            self._planform_area = self._calc_planform_area (x, le_y, te_y)
-        return self._planform_area
+        return self._cached ('planform_area', lambda: self._calc_planform_area (*self.le_te_polyline ()))
 
     @property
     def planform_mac (self) -> float:
         """ (approximated) mean aerodynamic chord"""
 
-        if self._planform_mac is None: 
-            # this is normally done automatically each time the le, te poyline is calculated
-            x, le_y, te_y = self.le_te_polyline ()
-            self._planform_mac = self._calc_mac (x, le_y, te_y)
-        return self._planform_mac
+        return self._cached ('planform_mac', lambda: self._calc_mac (*self.le_te_polyline ()))
 
     @property
     def chord_defined_by_sections (self) -> bool:
@@ -3006,6 +3510,12 @@ class Planform:
             te_y:   y coordinates of leading edge
         """
 
+        return self._cached ('le_te_polyline', self._le_te_polyline)
+
+
+    def _le_te_polyline (self) -> Polylines:
+        """ calculate polylines of leading and trailing edge"""
+
         xn, cn = self.n_distrib.polyline()
 
         xn, le_yn = self.t_chord_to_norm (xn, np.full (len(xn), 1.0), cn=cn)
@@ -3014,10 +3524,6 @@ class Planform:
         x, le_y = self.t_norm_to_plan (xn, le_yn)
         x, te_y = self.t_norm_to_plan (xn, te_yn)
 
-        # as we have the data, calc area 
-        self._planform_area = self._calc_planform_area (x, le_y, te_y)
-        self._planform_mac  = self._calc_mac (x, le_y, te_y)
-        
         return x, le_y, te_y 
 
 
@@ -3025,8 +3531,7 @@ class Planform:
         """ 
         polygon of the planform starting at le_root clockwise 
         """
-        x, le_y, te_y = self.le_te_polyline()
-        return self._polygon (x, le_y, te_y)
+        return self._cached ('polygon', lambda: self._polygon (*self.le_te_polyline()))
     
 
     def _polygon (self, x : np.ndarray, le_y : np.ndarray, te_y : np.ndarray) -> Polyline:
@@ -3058,14 +3563,12 @@ class Planform:
     def _calc_mac (self, x : np.ndarray, le_y : np.ndarray, te_y : np.ndarray):
         """calc mean aerodynamic chord """
 
-        # calc integral of square chord along span 
-        i_c2 = 0.0 
-        for i in range (len(x) -1):
-            dx = x[i+1] - x[i]
-            c_mean = (te_y[i] - le_y[i] + te_y[i+1] - le_y[i+1]) / 2.0          # chord mean vlaue of dx 
-            i_c2 += c_mean **2 * dx
+        # calc integral of square chord along span - chord mean value of each dx 
+        c      = te_y - le_y
+        c_mean = (c[:-1] + c[1:]) / 2.0 
+        i_c2   = np.sum (c_mean **2 * np.diff (x))
 
-        return i_c2 / self._calc_planform_area (x, le_y, te_y )
+        return i_c2 / self._calc_planform_area (x, le_y, te_y)
  
 
     def box_polygon (self) -> Polyline:
@@ -3077,6 +3580,12 @@ class Planform:
             y: y coordinates 
         """
 
+        return self._cached ('box_polygon', self._box_polygon)
+
+
+    def _box_polygon (self) -> Polyline:
+        """ calculate rectangle polygon"""
+
         # in normed - ref line is at yn=0 - so correct with chord reference at x=0
         cr_0 = self.n_chord_ref.at (0)
         le_yn = 0.0 - cr_0
@@ -3149,15 +3658,29 @@ class Planform:
             yn = round (yn,10)
             xn = round (xcn, 10)
 
-        else: 
-            # array loop over each xn as y will be depending on the position 
-            xn, yn = np.array (xcn), np.array (ycn)
+        else:
+            # array - evaluate chord reference and chord once for all xn
+            xcn = np.asarray (xcn, dtype=float)
+            ycn = np.broadcast_to (np.asarray (ycn, dtype=float), xcn.shape)
 
-            for i in range (len(xcn)):
-                cni = cn[i] if cn is not None else None
-                xn[i], yn[i] = self.t_chord_to_norm (xn[i], yn[i], cn=cni)
+            cr  = self.n_chord_ref.at (xcn)                          # chord reference function
 
-        return xn, yn 
+            if cn is None:
+                cn  = self.n_distrib.at(xcn)                           # chord
+            cn = np.asarray (cn, dtype=float)
+
+            # apply chord reference function - same arithmetic as 'interpolate'
+            le_yn =   cn * cr
+            te_yn = - cn * (1-cr)
+            yn = np.where (ycn == 0.0, te_yn, ((le_yn - te_yn) / (1.0 - 0.0)) * (ycn - 0.0) + te_yn)
+
+            # flip yn
+            yn = - yn
+
+            yn = np.round (yn,10)
+            xn = np.round (xcn, 10)
+
+        return xn, yn
 
 
 
@@ -3376,6 +3899,10 @@ class Planform_Paneled (Planform):
 
     """
 
+    # lines at le and te indicating chord difference between paneled and parent planform 
+    C_DIFF_DTYPE = np.dtype ([('x', float), ('le_y', float), ('te_y', float), 
+                              ('le_y_parent', float), ('te_y_parent', float)])
+
     def __init__(self, wing : Wing, dataDict: dict = None):
 
 
@@ -3386,6 +3913,8 @@ class Planform_Paneled (Planform):
         self._chord_root  = None
         self._sweep_angle = None
 
+        self._version       = 0                                         # modification counter of self
+
 
         # create Norm_Chord distribution based on parent planform 
 
@@ -3412,10 +3941,9 @@ class Planform_Paneled (Planform):
 
         self._use_nick_name  = fromDict (dataDict, "use_nick_name", False)           # use airfoil nick name for export%
 
-        self._is_width_min_applied = False                                           # flag for user info 
-        self._cn_diff              = 0.0                                             # cuurent max chord difference
 
         # dict of available panel distribution functions used for x and y  
+        #   - functions are evaluated on the whole array of stations 0..1 
 
         self._wy_distribution_fns = {}
         self._wy_distribution_fns["uniform"]= lambda y : y
@@ -3458,12 +3986,20 @@ class Planform_Paneled (Planform):
     def sweep_angle (self) -> float:
         return self._parent_planform.sweep_angle
 
+    @override
+    @property
+    def version (self) -> tuple:
+        """ version of self - changes with every modification of self, its panel parameters or parent"""
+        return (self._version, self.n_distrib.version, self.n_chord_ref.version, 
+                self.n_ref_line.version, self.wingSections.version, self._parent_planform._version)
+
 
     def wingSections_reduced (self) -> list[WingSection]:
         """ returns list of wing sections if applicable reduced when cn_tip_min """
         
+        nsec = len(self.n_distrib.polyline () [0])          # get effective no of sections fro polyline
+                                                            # ! before - polyline evaluates tip_min 
         if self.is_cn_tip_min_applied:
-            nsec = len(self.n_distrib.polyline () [0])      # get effective no of sections fro polyline
             sections = self._wingSections [:nsec]           # reduce 
         else: 
             sections = self._wingSections
@@ -3472,39 +4008,51 @@ class Planform_Paneled (Planform):
 
     @property
     def wx_panels (self):                return self._wx_panels
-    def set_wx_panels (self, val: int):  self._wx_panels = int(val)
+    def set_wx_panels (self, val: int):  
+        self._wx_panels = int(val)
+        self._version += 1
 
     @property
     def wx_dist (self):                  return self._wx_dist
     def set_wx_dist (self, val):  
         if val in self._wy_distribution_fns:
             self._wx_dist = val
+            self._version += 1
 
     @property
     def wy_panels (self):                return self._wy_panels
-    def set_wy_panels (self, val: int):  self._wy_panels = int(val)
+    def set_wy_panels (self, val: int):  
+        self._wy_panels = int(val)
+        self._version += 1
 
     @property
     def wy_dist (self):                  return self._wy_dist
     def set_wy_dist (self, val):  
         if val in self._wy_distribution_fns:
             self._wy_dist = val
+            self._version += 1
 
     @property
     def width_min (self):              return self._width_min
-    def set_width_min (self, val):     self._width_min = val
+    def set_width_min (self, val):     
+        self._width_min = val
+        self._version += 1
 
     @property
     def is_width_min_applied (self) -> bool:
         """ True if x_panels were reduced due to width_min"""
-        return self._is_width_min_applied
+        return self._panel_stations() [2]
 
     @property
-    def cn_diff (self):                 return self._cn_diff
+    def cn_diff (self) -> float:        
+        """ current max chord difference between paneled and parent planform"""
+        return self._c_diff() [1]
 
     @property
     def cn_diff_max (self):             return self._cn_diff_max
-    def set_cn_diff_max (self, val):    self._cn_diff_max = val
+    def set_cn_diff_max (self, val):    
+        self._cn_diff_max = val
+        self._version += 1
 
     @property
     def is_cn_diff_exceeded (self) -> bool:
@@ -3551,18 +4099,14 @@ class Planform_Paneled (Planform):
         wy_panels = wy_panels if wy_panels is not None else self.wy_panels 
 
         wy_dist_fn = self._wy_distribution_fns [self.wy_dist]
-        stations = np.linspace (0, 1, wy_panels +1)
-        for i, xni in enumerate(stations):
-            stations [i] = wy_dist_fn (xni)
+        stations = wy_dist_fn (np.linspace (0, 1, wy_panels +1))
         return np.round (stations,10)
 
 
     def _cn_rel_stations (self) -> np.ndarray:
         """ relative cn stations of the panels of a section"""
         wx_dist_fn = self._wy_distribution_fns [self.wx_dist]
-        stations = np.linspace (0, 1, self.wx_panels +1)
-        for i, yni in enumerate(stations):
-            stations [i] = wx_dist_fn (yni)
+        stations = wx_dist_fn (np.linspace (0, 1, self.wx_panels +1))
         return np.round (stations,10)
 
 
@@ -3570,15 +4114,34 @@ class Planform_Paneled (Planform):
         """
         x stations of all panels - optimized for width_min 
         """
+        return self._panel_stations() [0]
+
+
+    def _panel_stations (self) -> tuple [np.ndarray, np.ndarray, bool]:
+        """
+        Panel stations calculated once per version of self 
+
+        Returns:
+            x_stations: x stations of all panels - optimized for width_min 
+            nx_panels: number of panels of each wing section 
+            width_min_applied: True if panels were reduced due to width_min  
+        """
+        return self._cached ('panel_stations', self._calc_panel_stations)
 
-        self._is_width_min_applied = False
+
+    def _calc_panel_stations (self) -> tuple [np.ndarray, np.ndarray, bool]:
+        """ calculate x stations and number of panels per wing section - see '_panel_stations' """
+
+        width_min_applied = False
 
         # walk along span by section and add x stations 
 
         xn_sec = self.n_distrib.polyline()[0]                     # take poyline as it can be already reduced
 
+        wy_panels       = self.wy_panels
         xn_rel_stations = self._xn_rel_stations()
-        xn_stations = np.array ([0.0])
+        xn_stations     = [np.array ([0.0])]
+        rel_table       = None 
 
         for isec in range (1, len(xn_sec)):      
             
@@ -3586,17 +4149,41 @@ class Planform_Paneled (Planform):
             xn_sec_stations =  xn_rel_stations [1:] * section_width 
 
             # check and correct for min panel width 
-            wy_panels = self.wy_panels
-            while np.min (np.diff (xn_sec_stations)) < self._width_min and wy_panels > 2:
-                wy_panels -= 1
-                xn_rel_stations_tmp = self._xn_rel_stations(wy_panels)
-                xn_sec_stations     =  xn_rel_stations_tmp [1:] * section_width 
+            #   take the highest number of panels (at least 2) which fulfills width_min
+
+            if wy_panels > 2 and np.min (np.diff (xn_sec_stations)) < self._width_min:
+
+                if rel_table is None:
+                    # relative stations of all possible number of panels 2..wy_panels padded with nan 
+                    n_candidates = np.arange (2, wy_panels + 1)
+                    rel_table    = np.full ((len(n_candidates), wy_panels + 1), np.nan)
+                    for i, n in enumerate (n_candidates):
+                        rel_table [i, :n+1] = self._xn_rel_stations (n)
+
+                widths_min = np.nanmin (np.diff (rel_table [:,1:] * section_width, axis=1), axis=1)
+                i_ok       = np.flatnonzero (widths_min >= self._width_min)
+                n          = n_candidates [i_ok[-1]] if len(i_ok) else 2 
+
+                xn_sec_stations = rel_table [n-2, 1:n+1] * section_width 
+
+                width_min_applied = True                                    # flag for user info 
+
+            xn_stations.append (xn_sec_stations + xn_sec[isec-1])
+
+        xn_stations = np.concatenate (xn_stations)
+
+        x_stations = xn_stations * self._parent_planform.span
 
-                self._is_width_min_applied = True                           # flag for user info 
+        # number of panels of each wing section: stations left_x < x <= right_x 
+        #    - the tip section has no panels  
 
-            xn_stations = np.append (xn_stations, xn_sec_stations + xn_sec[isec-1])
+        left_x  = np.array ([section.x for section in self.wingSections])
+        right_x = np.append (left_x[1:], left_x[-1])
+        i_left  = np.searchsorted (x_stations, left_x,  side='right')
+        i_right = np.searchsorted (x_stations, right_x, side='right')
+        nx_panels = np.maximum (i_right - i_left, 0)
 
-        return xn_stations * self._parent_planform.span
+        return x_stations, nx_panels, width_min_applied
     
 
     def y_panel_polylines (self) -> tuple[list[Polyline], list[Polyline]]:
@@ -3650,22 +4237,22 @@ class Planform_Paneled (Planform):
 
         xn_stations = self._get_x_stations () / self.span
 
-        # now build and add for every x station a line from le to te 
+        # now build and add for every x station a line from le to te
+        #   all lines are transformed at once - pairs of (te, le) points
 
-        for xni in xn_stations:
+        xn_arr = np.repeat (xn_stations, 2)
+        cn_arr = np.tile (np.array([0.0, 1.0]), len(xn_stations))
 
-            xn_arr = np.array([xni, xni])
-            cn_arr = np.array([0.0, 1.0])
+        # transform from norm chord to norm planform
+        xn_arr, yn_arr = self.t_chord_to_norm (xn_arr, cn_arr)
 
-            # transform from norm chord to norm planform 
-            xn_arr, yn_arr = self.t_chord_to_norm (xn_arr, cn_arr)
+        # transform to plan
+        x_arr, y_arr = self.t_norm_to_plan (xn_arr, yn_arr)
 
-            # transform to plan 
-            x_arr, y_arr = self.t_norm_to_plan (xn_arr, yn_arr)
-
-            # build list of poylines 
-            x_list.append (x_arr)
-            y_list.append (y_arr)
+        # build list of poylines
+        for i in range (len(xn_stations)):
+            x_list.append (x_arr[2*i:2*i+2])
+            y_list.append (y_arr[2*i:2*i+2])
 
         return x_list, y_list
 
@@ -3673,87 +4260,118 @@ class Planform_Paneled (Planform):
     def nx_panels_of_section (self, index : int) -> int:
         """ returns the number of x panels of section having index""" 
 
-        left_sec_x  = self.wingSections [index].x
-
-        # sanity 
-        if index < (len(self._wingSections) - 1):
-            right_sec_x = self.wingSections [index+1].x
-        elif index == (len(self._wingSections) - 1):
-            right_sec_x = left_sec_x
+        # sanity
         if index > (len(self._wingSections) - 1):
             raise ValueError (f"Index {index} to get wing section is to high")        
 
-        x_stations = self._get_x_stations ()
+        return int (self._panel_stations() [1][index])
 
-        npan = 0 
-        for x in x_stations:
-            if x > left_sec_x and x <= right_sec_x:
-                npan += 1
-            elif x > right_sec_x:
-                break 
 
-        return npan                   
+    def nx_panels_of_sections (self) -> np.ndarray:
+        """ returns the number of x panels of all sections""" 
 
+        return self._panel_stations() [1]
 
-    def c_diff_lines (self) -> list:
-        """ returns a list with lines indicating the difference between chord paneled and chord parent"""
 
-        self._cn_diff = 0.0
+    def c_diff_lines (self) -> np.ndarray:
+        """ 
+        returns the x stations where the difference between chord paneled and chord parent 
+        exceeds cn_diff_max as structured array (see C_DIFF_DTYPE) having the fields 
+            x:              x station 
+            le_y, te_y:     leading and trailing edge of paneled planform 
+            le_y_parent, te_y_parent: leading and trailing edge of parent planform 
+        """
+        return self._c_diff() [0]
 
-        x_stations = self._get_x_stations ()
-        lines =[]
 
-        for xi in x_stations:
+    def _c_diff (self) -> tuple [np.ndarray, float]:
+        """ chord difference lines and max chord difference - calculated once per version of self"""
+        return self._cached ('c_diff', self._calc_c_diff)
 
-            # actual chords at station 
-            c_panel  = self.c_at (xi)
-            c_parent = self._parent_planform.c_at (xi)
-            c_diff   = c_parent - c_panel
 
-            if c_diff > (self.cn_diff_max * self.chord_root):
+    def _calc_c_diff (self) -> tuple [np.ndarray, float]:
+        """ calculate chord difference lines and max chord difference for all x stations """
 
-                # get leading and trailing edge of paneled and of parent planform 
-                le_y, te_y = self.le_te_at (xi)
-                le_y_parent, te_y_parent = self._parent_planform.le_te_at (xi)
-                
-                # line between both at le 
-                line_x, line_y = [xi, xi],  [le_y_parent, le_y]
-                lines.append ((line_x, line_y))
+        x_stations = self._get_x_stations ()
+
+        # actual chords at stations 
+        c_panel  = self.c_at (x_stations)
+        c_parent = self._parent_planform.c_at (x_stations)
+        c_diff   = c_parent - c_panel
 
-                # line between both at te 
-                line_x, line_y = [xi, xi],  [te_y_parent, te_y]
-                lines.append ((line_x, line_y))
+        cn_diff  = max (0.0, float (np.max (c_diff / self.chord_root)))          # max difference
 
-            self._cn_diff = max ((c_diff/self.chord_root), self.cn_diff)       # save max difference
+        # get leading and trailing edge of paneled and of parent planform where exceeded 
+        x = x_stations [c_diff > (self.cn_diff_max * self.chord_root)]
 
-        return lines 
+        lines = np.zeros (len(x), dtype=self.C_DIFF_DTYPE)
+        if len(x):
+            lines['x'] = x
+            lines['le_y'], lines['te_y'] = self.le_te_at (x)
+            lines['le_y_parent'], lines['te_y_parent'] = self._parent_planform.le_te_at (x)
 
+        return lines, cn_diff
 
 
-    def optimize_cn_diff (self):
-        """ insert new sections until chord difference is below max value """
+
+    def optimize_cn_diff (self, n_samples : int = 20):
+        """ 
+        insert new sections until chord difference is below max value 
+
+        The chord difference of each interval between two sections is evaluated at n_samples 
+        points. The interval with the highest difference is split by a new section at the 
+        point of max difference until all intervals are below cn_diff_max.
+        """
 
         if not self.is_cn_diff_exceeded: return 
 
-        i_cycle = 1
+        sections       = self.wingSections
+        parent_distrib = self._parent_planform.n_distrib
+        safety         = sections[-1].xn / 500.0                    # min distance of sections (see xn_cn_limits_of)
 
-        while self.c_diff_lines() and i_cycle < 15:            # max iterations 
+        heap    = []                                                # max heap of intervals by chord difference 
+        n_push  = 0                                                 # tie breaker for equal differences
 
-            sections = self.wingSections
+        def push_interval (left : tuple, right : tuple):
+            """ evaluate interval (section, xn, cn) .. (section, xn, cn) and push if cn_diff_max is exceeded"""
+            nonlocal n_push
+            (_, xn_left, cn_left), (_, xn_right, cn_right) = left, right
 
-            for i_sec in range (len(sections) - 1):
+            if (xn_right - xn_left) < 2 * safety: return 
 
-                # test chord difference in the middle of the section 
-                xni = (sections[i_sec].xn + sections[i_sec+1].xn) / 2
-                cn_panel  = self._n_distrib.at (xni)
-                cn_parent = self._parent_planform.n_distrib.at (xni)
-                if (cn_parent - cn_panel) > self.cn_diff_max:
+            xn = np.linspace (xn_left, xn_right, n_samples + 2) [1:-1]
+            cn_panel = np.interp (xn, [xn_left, xn_right], [cn_left, cn_right])
+            cn_diff  = parent_distrib.at (xn, fast=False) - cn_panel
 
-                    # too much difference - insert section at mean cn value 
-                    sections.create_after (index=i_sec)
-                    break
+            i_max = np.argmax (cn_diff)
+            if cn_diff [i_max] > self.cn_diff_max:
+                heapq.heappush (heap, (-cn_diff [i_max], n_push, left, right, xn [i_max]))
+                n_push += 1
+
+        # init heap with the intervals of the (reduced) sections of paneled planform 
+
+        reduced = [(section, section.xn, section.cn) for section in self.wingSections_reduced()]
+        for left, right in zip (reduced [:-1], reduced [1:]):
+            push_interval (left, right)
+
+        # split worst interval - only the two new intervals have to be evaluated 
+
+        while heap:
+
+            _, _, left, right, xn_split = heapq.heappop (heap)
+            left_sec, xn_left, _ = left
+
+            cn_new  = parent_distrib.at (xn_split, fast=False)
+            new_sec = sections.create_after (left_sec, cn=cn_new)
+            xn_new  = new_sec.xn
+
+            if not (xn_left < xn_new < right[1]):                   # chord not monotonic - new section misplaced 
+                sections.delete (new_sec)
+                continue
 
-            i_cycle += 1
+            new = (new_sec, xn_new, new_sec.cn)
+            push_interval (left, new)
+            push_interval (new, right)
 
 
 
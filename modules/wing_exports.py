@@ -10,9 +10,12 @@ Handle export of airfoils to file
 import logging
 import os, re
 import io
+import time
+import multiprocessing
 import numpy as np
 
 from copy                   import deepcopy
+from concurrent.futures     import ProcessPoolExecutor, ThreadPoolExecutor
 from typing                 import TextIO
 from datetime               import datetime 
 from math                   import atan, pi
@@ -26,10 +29,42 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 
+def _airfoil_dat (x : np.ndarray, y : np.ndarray, name : str, pathFileName : str, 
+                  geometry_class, te_gap : float|None) -> tuple [str, str, float]:
+    """ 
+    worker of airfoil export - TE gap adaption and .dat formatting of an airfoil copy 
+
+    Returns:
+        pathFileName, content of .dat file, time needed 
+    """
+
+    start = time.perf_counter()
+
+    airfoil = Airfoil (x=x, y=y, name=name, pathFileName=pathFileName, geometry=geometry_class)
+    if te_gap is not None: 
+        airfoil.geo.set_te_gap (te_gap)                             # will modify name and pathFileName
+
+    pathFileName = os.path.splitext(airfoil.pathFileName)[0] + ".dat"
+    return pathFileName, airfoil.as_dat_text(), time.perf_counter() - start
+
+
+def _write_text (pathFileName : str, text : str) -> float:
+    """ writes text to file - returns time needed"""
+
+    start = time.perf_counter()
+    with open(pathFileName, 'w+') as file:
+        file.write (text)
+    return time.perf_counter() - start
+
+
+
 class Export_Airfoils:
     """ 
     Handle export of the current airfoils of wing to a subdirectory
     """
+
+    MAX_WRITE_THREADS = 4                                   # bounded thread pool for file writes
+
     def __init__(self, wing : Wing, myDict: dict = None):
  
         self._wing       = wing
@@ -39,6 +74,9 @@ class Export_Airfoils:
         self._adapt_te_gap       = fromDict (myDict, "adapt_te_gap", False)
         self._te_gap_mm          = fromDict (myDict, "te_gap_mm", 0.5)
 
+        self._workers            = 1                        # worker processes to prepare airfoils
+        self._timing             = []                       # per file timing of last export 
+
     def _as_dict (self) -> dict:
         """ returns a data dict with the paramters of self"""
 
@@ -87,6 +125,18 @@ class Export_Airfoils:
     def n_airfoils (self) -> int:
         """ nuber of airfoils being exported"""
         return len (self._wingSections)
+
+    @property
+    def workers (self) -> int:
+        """ number of worker processes for TE gap adaption and formatting - 1 is sequential"""
+        return self._workers
+    def set_workers (self, aVal : int|None): 
+        self._workers = max (1, int(aVal)) if aVal else (os.cpu_count() or 1)
+
+    @property
+    def timing (self) -> list [tuple [str, float, float]]:
+        """ per file timing of last export - list of fileName, prepare time, write time"""
+        return self._timing
     
 
 
@@ -112,9 +162,9 @@ class Export_Airfoils:
 
         self._wingSections.do_strak (geometry_class=GEO_SPLINE)          
 
-        # save airfoils of all sections  
+        # prepare copies of airfoils to save 
 
-        fileNames  = []
+        copies  = []
         section : WingSection
 
         for section in self._wingSections:
@@ -128,19 +178,80 @@ class Export_Airfoils:
                 te_gap = self.te_gap_mm / (section.cn * self._chord_root)
             else: 
                 te_gap = None 
-        
-            pathFileName = section.airfoil.save_copyAs (dir=targetDir, destName = newName, te_gap = te_gap)
 
-            fileNames.append (os.path.basename(pathFileName) )
+            if section.airfoil.isBezierBased or section.airfoil.isHicksHenneBased:
+                job = None                                              # can't be rebuilt from x,y 
+            else: 
+                airfoil = section.airfoil.copy_for_save (dir=targetDir, destName=newName)
+                job = (airfoil.x, airfoil.y, airfoil.name, airfoil.pathFileName, airfoil.geo.__class__, te_gap)
+
+            copies.append ((section.airfoil, newName, te_gap, job))
+
+        # TE gap adaption and formatting in worker processes - file writes in threads 
+
+        prepared = self._prepare_dat (copies, targetDir)
+
+        fileNames    = []
+        self._timing = []
 
+        with ThreadPoolExecutor (max_workers=self.MAX_WRITE_THREADS) as writer:
+            writes = [writer.submit (_write_text, pathFileName, text) if text is not None else None
+                      for pathFileName, text, _ in prepared]
+
+            for (pathFileName, _, t_prepare), write in zip (prepared, writes):
+                t_write = write.result() if write is not None else 0.0
+                fileName = os.path.basename(pathFileName)
+                fileNames.append (fileName)
+                self._timing.append ((fileName, t_prepare, t_write))
 
         logger.info (f"{self.n_airfoils} Airfoils written to '{targetDir}'") 
+        for fileName, t_prepare, t_write in self._timing:
+            logger.debug (f"   {fileName:40} prepare {t_prepare*1000:7.1f}ms   write {t_write*1000:7.1f}ms")
+
+        return fileNames
 
-        return 
+
+    def _prepare_dat (self, copies : list [tuple], targetDir : str) -> list [tuple [str, str|None, float]]:
+        """ 
+        TE gap adaption and .dat formatting of the airfoil copies - with more than 1 worker 
+            in a process pool. Bezier or Hicks-Henne airfoils are saved directly 
+
+        Args:
+            copies: list of airfoil, newName, te_gap and arguments of '_airfoil_dat' or None 
+        Returns:
+            list of pathFileName, .dat content or None if already saved, time needed 
+        """
+
+        jobs = {i : job for i, (_, _, _, job) in enumerate (copies) if job is not None}
+        prepared = {}
+
+        # 'spawn' - forking a process with running Qt threads isn't safe 
+        if self.workers > 1 and len(jobs) > 1:
+            try:
+                with ProcessPoolExecutor (max_workers=min (self.workers, len(jobs)),
+                                          mp_context=multiprocessing.get_context ("spawn")) as pool:
+                    futures  = {i : pool.submit (_airfoil_dat, *args) for i, args in jobs.items()}
+                    prepared = {i : future.result() for i, future in futures.items()}
+            except Exception as e:
+                logger.warning (f"Parallel airfoil export failed - falling back to sequential: {e}")
+                prepared = {}
+
+        result = []
+        for i, (airfoil, newName, te_gap, job) in enumerate (copies):
+            if i in prepared:
+                result.append (prepared [i])
+            elif job is not None: 
+                result.append (_airfoil_dat (*job))
+            else:
+                start = time.perf_counter()
+                pathFileName = airfoil.save_copyAs (dir=targetDir, destName=newName, te_gap=te_gap)
+                result.append ((pathFileName, None, time.perf_counter() - start))
+        return result
 
 
 
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
 
 
 class Export_Xflr5:
@@ -230,6 +341,127 @@ class Export_Xflr5:
 
 
     def export_wing (self, pathFileName):
+        """ writes the xflr5 wing xml file with the streaming writer 'write_wing'"""
+
+        # like ElementTree: ascii with character references for other characters  
+        with open (pathFileName, 'w', encoding='us-ascii', errors='xmlcharrefreplace') as stream:
+            self.write_wing (stream)
+
+
+    def write_wing (self, stream : TextIO):
+        """ 
+        Streaming writer of the xflr5 wing xml - emits the xml in one pass over the sections 
+        with the same layout as the template based 'export_wing_template'.
+        Allows to generate many variants quickly e.g. in parameter sweeps
+        """
+
+        sections = self._wingSections
+        paneled  = self._planform_paneled
+        table    = self._section_table (sections)
+
+        x_number       = str (paneled.wy_panels)
+        x_distribution = self.distrib_name_map[paneled.wy_dist]
+        y_distribution = self.distrib_name_map[paneled.wx_dist]
+
+        # airfoil - use nick name? 
+        if self.use_nick_name:
+            airfoilNames = [section.airfoil_nick_name for section in sections]
+        else: 
+            airfoilNames = [section.airfoil.name for section in sections]
+
+        stream.write (self.XML_HEAD.format (name=escape (str(self._wing.name)), 
+                                            description="by Planform Creator 2"))
+
+        # ! x and y are swapped !
+        for row, airfoilName in zip (table, airfoilNames):
+
+            stream.write (self.XML_SECTION.format (
+                            y_position=row['x'], chord=row['te_y'] - row['le_y'], xOffset=row['le_y'], 
+                            x_number_of_panels=x_number, x_panel_distribution=x_distribution,
+                            y_number_of_panels=row['nx_panels'], 
+                            y_panel_distribution=y_distribution,
+                            foilName=escape (re.sub('.dat', '', airfoilName))))
+
+        stream.write (self.XML_TAIL)
+
+
+    SECTION_DTYPE = np.dtype ([('x', float), ('le_y', float), ('te_y', float), ('nx_panels', int)])
+
+    def _section_table (self, sections : list[WingSection]) -> np.ndarray:
+        """ 
+        section data of paneled planform as tip could be cutted - as structured array (see SECTION_DTYPE) 
+            x:              x position of section 
+            le_y, te_y:     leading and trailing edge 
+            nx_panels:      number of x panels of section 
+        """
+
+        table = np.zeros (len(sections), dtype=self.SECTION_DTYPE)
+
+        # le and te with scalar 'le_te' as the array evaluation of banana planforms 
+        # differs in the last digits from the template based export 
+        le_te = np.array ([section.le_te () for section in sections])
+
+        table['x']         = [section.x for section in sections]
+        table['le_y']      = le_te [:,0]
+        table['te_y']      = le_te [:,1]
+        table['nx_panels'] = self._planform_paneled.nx_panels_of_sections () [:len(sections)]
+        return table
+
+
+    # xml fragments of streaming writer - same layout as ElementTree output of template  
+
+    XML_HEAD = (
+        '<explane version="1.0">\n'
+        '        <Units>\n'
+        '            <length_unit_to_meter>0.001</length_unit_to_meter>\n'
+        '            <mass_unit_to_kg>0.001</mass_unit_to_kg>\n'
+        '        </Units>\n'
+        '        <wing>\n'
+        '            <Name>{name}</Name>\n'
+        '            <Type>MAINWING</Type>\n'
+        '            <Color>\n'
+        '                <red>255</red>\n'
+        '                <green>255</green>\n'
+        '                <blue>127</blue>\n'
+        '                <alpha>255</alpha>\n'
+        '            </Color>\n'
+        '            <Description>{description}</Description>\n'
+        '            <Position>          0,           0,           0</Position>\n'
+        '            <Tilt_angle>  0.000</Tilt_angle>\n'
+        '            <Symetric>true</Symetric>\n'
+        '            <isFin>false</isFin>\n'
+        '            <isDoubleFin>false</isDoubleFin>\n'
+        '            <isSymFin>false</isSymFin>\n'
+        '            <Inertia>\n'
+        '                <Volume_Mass>  2.500</Volume_Mass>\n'
+        '            </Inertia>\n'
+        '            <Sections>\n'
+        '                ')
+
+    XML_SECTION = (
+        '<Section>\n'
+        '                    <y_position>{y_position}</y_position>\n'
+        '                    <Chord>{chord}</Chord>\n'
+        '                    <xOffset>{xOffset}</xOffset>\n'
+        '                    <Dihedral>0</Dihedral>\n'
+        '                    <Twist>  0.000</Twist>\n'
+        '                    <x_number_of_panels>{x_number_of_panels}</x_number_of_panels>\n'
+        '                    <x_panel_distribution>{x_panel_distribution}</x_panel_distribution>\n'
+        '                    <y_number_of_panels>{y_number_of_panels}</y_number_of_panels>\n'
+        '                    <y_panel_distribution>{y_panel_distribution}</y_panel_distribution>\n'
+        '                    <Left_Side_FoilName>{foilName}</Left_Side_FoilName>\n'
+        '                    <Right_Side_FoilName>{foilName}</Right_Side_FoilName>\n'
+        '                </Section>\n'
+        '            ')
+
+    XML_TAIL = (
+        '</Sections>\n'
+        '        </wing>\n'
+        '    </explane>')
+
+
+    def export_wing_template (self, pathFileName):
+        """ writes the xflr5 wing xml file based on the xml template"""
 
         # get file object with xflr xml templae 
         templateFile = Export_Xflr5.Xflr5_template().get_template_wing()
@@ -939,23 +1171,17 @@ class Export_Dxf:
             self.msp = self.doc.modelspace()
 
 
-        def _arr_to_poly (self, x,y):
-            """ converts the two x,y arrays to an array of points (x,y) """
-            poly = []
-            for i, x in enumerate(x): 
-                poly.append ((x, y[i]))
-            return poly
+        def _arr_to_poly (self, x,y) -> np.ndarray:
+            """ converts the two x,y arrays to an array of points (x,y) with shape (n,2)"""
+            return np.column_stack ((np.asarray (x, dtype=float), np.asarray (y, dtype=float)))
 
 
-        def _y_mirror (self, y_arr : list) -> list: 
+        def _y_mirror (self, y_arr : np.ndarray|list) -> np.ndarray: 
             """ mirrors y values so that 
             - te point of root will be at 0,0 
             - le point of root will be at 0, rootchord"""
-            mirrored_y = np.empty (len(y_arr))
             y_mirror = self._planform.chord_root / 2               # flip x  around half rootchord
-            for i, y in enumerate(y_arr):
-                mirrored_y [i] = y_mirror - (y - y_mirror)
-            return mirrored_y
+            return y_mirror - (np.asarray (y_arr, dtype=float) - y_mirror)
 
 
         def _plot_line_fromPoints (self, pointList ):
@@ -979,14 +1205,8 @@ class Export_Dxf:
             te = self._y_mirror (te)
 
             # make a polygon for the planform contour from 0,0 - root - le - tip - te - root 
-            x_c = [0.0]
-            y_c = [0.0]
-            x_c.extend(x)
-            y_c.extend(le)
-            x  = np.flip(x)
-            te = np.flip(te)
-            x_c.extend(x)
-            y_c.extend(te)
+            x_c = np.concatenate (([0.0], x,  np.flip(x)))
+            y_c = np.concatenate (([0.0], le, np.flip(te)))
 
             # insert into dxf doc
             self._plot_line_fromArray (x_c, y_c)
@@ -1025,8 +1245,8 @@ class Export_Dxf:
             sec : WingSection
             for sec in self._planform.wingSections:
 
-                _, le_te = sec.line()               # le from sec line - we have to mirror 
-                y_m = self._y_mirror (le_te)[0] + 20  
+                le, _ = sec.le_te()                 # le of section - we have to mirror 
+                y_m = float (self._y_mirror (le)) + 20  
 
                 x_m = sec.x
                 p1 = (x_m, y_m)
@@ -1071,8 +1291,8 @@ class Export_Dxf:
 
                 x = x + sec.x - sec.c /4                # center t/4 above ypos of section 
 
-                _, le_te = sec.line()                   # le from sec line - we have to mirror 
-                y_m = self._y_mirror (le_te)[0] + 20 + 80 
+                le, _ = sec.le_te()                     # le of section - we have to mirror 
+                y_m = float (self._y_mirror (le)) + 20 + 80 
                 y = y + y_m                             # shift upward 
 
                 self._plot_line_fromArray (x,y)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+    Wing exports pytest classes
+
+"""
+
+import pytest
+
+import os
+import sys
+import glob
+from pathlib import Path
+
+# let python find the other modules in modules relativ to path of self
+sys.path.insert (1,os.path.join(Path(__file__).parent.parent , 'AirfoilEditor_subtree/modules'))
+sys.path.insert (1,os.path.join(Path(__file__).parent))
+
+from wing                   import Wing
+
+
+TEMPLATES = sorted (glob.glob (os.path.join (Path(__file__).parent.parent, 'templates', '*.pc2')) +
+                    glob.glob (os.path.join (Path(__file__).parent.parent, 'examples', '*', '*.pc2')))
+
+
+class Test_Export_Xflr5:
+
+    @pytest.mark.parametrize ("pc2_file", TEMPLATES, ids=os.path.basename)
+    def test_streaming_equals_template (self, pc2_file, tmp_path):
+
+        # streaming writer must be byte equivalent to the xml template based export
+
+        wing = Wing (pc2_file)
+
+        for use_nick_name in [False, True]:
+
+            wing.planform_paneled.set_use_nick_name (use_nick_name)
+
+            template_file  = tmp_path / "template.xml"
+            streaming_file = tmp_path / "streaming.xml"
+
+            wing.export_xflr5.export_wing_template (template_file)
+            wing.export_xflr5.export_wing (streaming_file)
+
+            assert streaming_file.read_bytes() == template_file.read_bytes()
+
+
+    def test_special_characters (self, tmp_path):
+
+        # xml escapes and non ascii characters
+
+        wing = Wing (TEMPLATES[0])
+        wing.set_name ("Wing <Flügel> & Co")
+
+        template_file  = tmp_path / "template.xml"
+        streaming_file = tmp_path / "streaming.xml"
+
+        wing.export_xflr5.export_wing_template (template_file)
+        wing.export_xflr5.export_wing (streaming_file)
+
+        assert streaming_file.read_bytes() == template_file.read_bytes()
+
+
+def bench_export_dxf ():
+    """ benchmark of full dxf export including airfoils for the bundled templates"""
+
+    import tempfile
+    import logging
+    from timeit import default_timer as timer
+
+    logging.disable (logging.INFO)
+
+    with tempfile.TemporaryDirectory () as tmp_dir:
+
+        for pc2_file in TEMPLATES:
+
+            wing = Wing (pc2_file)
+            wing.set_name (wing.name.replace ('/', '_'))            # name is used as filename
+            wing.export_dxf.set_export_dir (tmp_dir)
+            wing.export_dxf.set_export_airfoils (True)
+
+            start = timer()
+            wing.export_dxf.do_it ()
+            t_first = timer() - start
+
+            start = timer()
+            wing.export_dxf.do_it ()
+            t_again = timer() - start
+
+            print (f"{os.path.basename(pc2_file):20}  sections {len(wing.planform.wingSections):3d}   " + 
+                   f"first {t_first*1000:8.1f}ms   again {t_again*1000:8.1f}ms")
+
+
+# Main program for testing 
+if __name__ == "__main__":
+
+    bench_export_dxf ()
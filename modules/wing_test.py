@@ -0,0 +1,446 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+
+    Wing model pytest classes
+
+"""
+
+import pytest
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# let python find the other modules in modules relativ to path of self
+sys.path.insert (1,os.path.join(Path(__file__).parent.parent , 'AirfoilEditor_subtree/modules'))
+sys.path.insert (1,os.path.join(Path(__file__).parent))
+
+from wing                   import Wing, Flaps, WingSections
+from model.airfoil          import Airfoil, GEO_BASIC
+
+
+TEMPLATE_BOW       = os.path.join (Path(__file__).parent.parent, 'templates', 'Bow.pc2')
+TEMPLATE_TRAPEZOID = os.path.join (Path(__file__).parent.parent, 'templates', 'Trapezoid.pc2')
+TEMPLATE_F3B       = os.path.join (Path(__file__).parent.parent, 'templates', 'F3B_F3F.pc2')
+AMOKKA_JX          = os.path.join (Path(__file__).parent.parent, 'examples', 'Amokka-JX', 'Amokka-JX.pc2')
+
+
+def _edit_banana (wing : Wing):
+    # move banana point of reference line like the diagram does - straight line becomes banana 
+    n_ref_line = wing.planform.n_ref_line
+    if not n_ref_line.is_banana:
+        n_ref_line.set_is_banana (True)
+    jpoints = n_ref_line.bezier_as_jpoints ()
+    jpoints[1].set_y (jpoints[1].y + 0.1)
+    n_ref_line.bezier_from_jpoints (jpoints)
+
+PLANFORM_EDITS = {
+    'span'      : lambda wing: wing.planform.set_span (wing.planform.span * 1.1),
+    'chord_root': lambda wing: wing.planform.set_chord_root (wing.planform.chord_root * 0.9),
+    'sweep'     : lambda wing: wing.planform.set_sweep_angle (wing.planform.sweep_angle + 3.0),
+    'cr_tip'    : lambda wing: wing.planform.n_chord_ref.set_cr_tip (wing.planform.n_chord_ref.cr_tip - 0.1),
+    'banana'    : _edit_banana,
+    'section'   : lambda wing: wing.planform.wingSections[1].set_cn (wing.planform.wingSections[1].cn - 0.05),
+    'tip_min'   : lambda wing: wing.planform_paneled.set_cn_tip_min (0.3),
+    'hinge'     : lambda wing: wing.planform.wingSections[1].set_hinge_cn (0.6),
+}
+
+
+class Test_Planform:
+
+    def _results (self, wing : Wing) -> list:
+        """ cached results of planform, paneled planform and flaps as flat list"""
+
+        planform = wing.planform
+        paneled  = wing.planform_paneled
+
+        return [*planform.le_te_polyline (), planform.planform_area, planform.planform_mac,
+                *paneled._panel_stations (), paneled.c_diff_lines (), *paneled.le_te_polyline (),
+                *planform.flaps.hinge_polyline ()]
+
+
+    @pytest.mark.parametrize ("pathFileName", [TEMPLATE_BOW, TEMPLATE_TRAPEZOID], ids=['Bow', 'Trapezoid'])
+    @pytest.mark.parametrize ("edit", PLANFORM_EDITS.keys())
+    def test_cache_invalidated (self, pathFileName, edit):
+
+        # results of a warm wing must be equal to a fresh wing after the same edit
+
+        wing = Wing (pathFileName)
+        results_before = self._results (wing)                           # warm caches 
+
+        PLANFORM_EDITS[edit] (wing)
+        results = self._results (wing)
+
+        wing_fresh = Wing (pathFileName)
+        PLANFORM_EDITS[edit] (wing_fresh)
+        results_fresh = self._results (wing_fresh)
+
+        assert len (results) == len (results_fresh) == len (results_before)
+        for result, result_fresh in zip (results, results_fresh):
+            assert np.array_equal (result, result_fresh)
+
+
+class Test_N_Distrib:
+
+    EDITS = [lambda wing: wing.planform.wingSections[1].set_xn (0.4),
+             lambda wing: wing.planform.wingSections[1].set_cn (0.8),
+             lambda wing: wing.planform.wingSections.create_after (wing.planform.wingSections[1]),
+             lambda wing: wing.planform.wingSections.delete (wing.planform.wingSections[1]),
+             lambda wing: wing.planform_paneled.set_cn_tip_min (0.3)]
+
+    def _results (self, n_distrib) -> list:
+        """ polyline, cn at xn and xn at cn of a distribution"""
+
+        xn_s = np.linspace (0.0, 1.0, 21)
+        cn_s = np.linspace (1.0, 0.4, 13)
+        return [*n_distrib.polyline (), 
+                n_distrib.at (xn_s), [n_distrib.at (float(xn)) for xn in xn_s],
+                [n_distrib.xn_at (float(cn)) for cn in cn_s]]
+
+
+    def test_knots_follow_edits (self):
+
+        # cached knots of trapezoid and paneled distribution must follow the edits of sections  
+
+        wing = Wing (TEMPLATE_TRAPEZOID)
+
+        for i_edit, edit in enumerate (self.EDITS):
+
+            n_distribs = [wing.planform.n_distrib, wing.planform_paneled.n_distrib]
+            for n_distrib in n_distribs:
+                n_distrib.at (0.5)                                      # warm knots 
+
+            edit (wing)
+
+            wing_fresh = Wing (TEMPLATE_TRAPEZOID)
+            for edit_fresh in self.EDITS [:i_edit+1]:
+                edit_fresh (wing_fresh)
+            n_distribs_fresh = [wing_fresh.planform.n_distrib, wing_fresh.planform_paneled.n_distrib]
+
+            for n_distrib, n_distrib_fresh in zip (n_distribs, n_distribs_fresh):
+                for result, result_fresh in zip (self._results (n_distrib), self._results (n_distrib_fresh)):
+                    assert np.array_equal (result, result_fresh)
+
+
+class Test_Planform_Paneled:
+
+    def test_wingSections_reduced_fresh_wing (self):
+
+        # tip section cut off by cn_tip_min must be removed already on first access 
+
+        wing    = Wing (TEMPLATE_BOW)
+        paneled = wing.planform_paneled
+
+        sections = paneled.wingSections_reduced ()
+
+        assert paneled.is_cn_tip_min_applied
+        assert len (sections) == len (paneled.n_distrib.polyline ()[0])
+        assert len (sections) == len (wing.planform.wingSections) - 1
+
+
+class Test_Wing_Sections:
+
+    def _assert_xn_cn_resolved (self, wing : Wing):
+        """ xn and cn of all sections must be equal to a fresh evaluation of the planform"""
+
+        planform = wing.planform
+        for section in planform.wingSections:
+            xn = planform.xn_at_cn (section.cn, fast=False)             if section._xn is None else section._xn
+            cn = planform.cn_at (section.xn, fast=False, normed=True)   if section._cn is None else section._cn
+            assert (section.xn, section.cn) == (xn, cn)
+
+
+    def test_drag_section (self):
+
+        # resolved xn, cn of sections must follow a section dragged by chord and by position 
+
+        wing     = Wing (AMOKKA_JX)
+        sections = wing.planform.wingSections
+        section  = sections[3]
+
+        assert section.is_cn_fix and not section.is_xn_fix
+        self._assert_xn_cn_resolved (wing)
+
+        for step in range (5):
+            section.set_cn (section.cn - 0.01)
+            assert section.is_cn_fix and not section.is_xn_fix
+            self._assert_xn_cn_resolved (wing)
+
+        # a setter may read xn, cn after changing the inputs but before the version is increased 
+
+        section._cn = round (section.cn - 0.01, 10)
+        self._assert_xn_cn_resolved (wing)
+        sections._changed ()
+
+        for step in range (5):
+            section.set_xn (section.xn - 0.01)
+            assert section.is_xn_fix and not section.is_cn_fix
+            self._assert_xn_cn_resolved (wing)
+
+        for step in range (5):
+            section.set_cn (section.cn + 0.005 * step)
+            self._assert_xn_cn_resolved (wing)
+            section.set_xn (section.xn + 0.005 * step)
+            self._assert_xn_cn_resolved (wing)
+
+
+class Test_Flaps:
+
+    def test_flaps_follow_section_edits (self):
+
+        # cached flaps and hinge line must follow edits of hinge and flap group in sections
+
+        wing     = Wing (TEMPLATE_BOW)
+        flaps    : Flaps = wing.planform.flaps
+        sections = wing.planform.wingSections
+
+        assert [flap.name for flap in flaps.get()] == ['1', '2']
+        hinge_x, _ = flaps.hinge_polyline ()
+        assert list (hinge_x) == [sec.x for sec in sections]
+
+        # hinge of middle section
+
+        sections[1].set_hinge_cn (0.5)
+
+        _, hinge_y = flaps.hinge_polyline ()
+        assert hinge_y[1] == sections[1].hinge_y
+
+        x, y = flaps.get()[0].polygon ()
+        assert (x[2], y[2]) == (sections[1].x, sections[1].hinge_y)     # hinge point at x_to
+        assert np.all ((x[4:] >= x[0]) & (x[4:] <= x[2]))                # along te back to x_from
+
+        # flap group of middle section - one flap from root to tip
+
+        sections[1].set_flap_group (1)
+
+        flap_list = flaps.get()
+        assert [flap.name for flap in flap_list] == ['1']
+        assert flap_list[0].x_to == sections[-1].x
+
+        x, y = flap_list[0].polygon ()
+        assert (x[2], y[2]) == (sections[-1].x, sections[-1].hinge_y)
+
+        # remove hinge definition of middle section
+
+        sections[1].hinge_remove ()
+
+        hinge_x, _ = flaps.hinge_polyline ()
+        assert list (hinge_x) == [sections[0].x, sections[-1].x]
+
+
+class Test_Strak:
+
+    def _blended_airfoils (self, monkeypatch) -> list:
+        """ spy on blend of airfoils - returns list which will be filled with the blended airfoils"""
+
+        blended = []
+
+        def spy (method):
+            def wrapper (airfoil, *args, **kwargs):
+                blended.append (airfoil)
+                return method (airfoil, *args, **kwargs)
+            return wrapper
+
+        monkeypatch.setattr (Airfoil, 'do_blend',         spy (Airfoil.do_blend))
+        monkeypatch.setattr (Airfoil, 'set_blend_result', spy (Airfoil.set_blend_result))
+        return blended
+
+
+    def _real_airfoil (self, fileName : str) -> Airfoil:
+        airfoil = Airfoil (pathFileName=os.path.join (Path(AMOKKA_JX).parent, fileName), geometry=GEO_BASIC)
+        airfoil.load ()
+        return airfoil
+
+
+    def test_strak_skipped (self, monkeypatch):
+
+        # a second strak without changes must not blend again 
+
+        wing     = Wing (AMOKKA_JX)
+        sections = wing.planform.wingSections
+        sections.do_strak ()
+
+        blend_airfoils = [sec.airfoil for sec in sections if sec.airfoil.isBlendAirfoil]
+        xy_before      = [(np.copy (a.x), np.copy (a.y)) for a in blend_airfoils]
+        skipped        = sections.strak_skipped
+        blended        = self._blended_airfoils (monkeypatch)
+
+        sections.do_strak ()
+
+        assert sections.strak_skipped == skipped + len (blend_airfoils) == skipped + 6
+        assert blended == []
+        for airfoil, (x, y) in zip (blend_airfoils, xy_before):
+            assert np.array_equal (airfoil.x, x) and np.array_equal (airfoil.y, y)
+
+
+    def test_strak_after_set_airfoil (self, monkeypatch):
+
+        # only the blends between the neighbours of a section with a new airfoil are blended again 
+
+        wing     = Wing (AMOKKA_JX)
+        sections = wing.planform.wingSections
+
+        sections[2].set_airfoil (self._real_airfoil ('JX-RS.dat'))        # blends 1 | 3 4 | 6  
+        sections[5].set_airfoil (self._real_airfoil ('JX-RS.dat'))
+        sections.do_strak ()
+
+        blended = self._blended_airfoils (monkeypatch)
+        skipped = sections.strak_skipped
+
+        sections[2].set_airfoil (self._real_airfoil ('JX-RS-Tip.dat'))
+        sections.do_strak ()
+
+        assert blended == [sections[1].airfoil, sections[3].airfoil, sections[4].airfoil]
+        assert sections.strak_skipped == skipped + 1
+
+
+    def test_strak_after_set_cn (self, monkeypatch):
+
+        # only a blend section which was moved is blended again 
+
+        wing     = Wing (AMOKKA_JX)
+        sections = wing.planform.wingSections
+        sections.do_strak ()
+
+        blended = self._blended_airfoils (monkeypatch)
+        skipped = sections.strak_skipped
+
+        sections[3].set_cn (sections[3].cn - 0.02)
+        sections.do_strak ()
+
+        assert blended == [sections[3].airfoil]
+        assert sections.strak_skipped == skipped + 5
+
+
+    def test_blend_cache_directory (self, monkeypatch, tmp_path):
+
+        # a reopened wing takes its blends from the persisted results - a broken file is a miss
+
+        cache = WingSections.BLEND_CACHE
+        directory_before = cache.directory
+
+        cache.set_directory (str (tmp_path))
+        cache.memory.clear ()
+
+        try:
+            wing = Wing (AMOKKA_JX)
+            wing.planform.wingSections.do_strak ()                    # all blended by Airfoil.do_blend 
+            blend_airfoils = [sec.airfoil for sec in wing.planform.wingSections if sec.airfoil.isBlendAirfoil]
+
+            npz_files = sorted (tmp_path.glob ('*.npz'))
+            assert len (npz_files) == len (blend_airfoils) == 6
+
+            # second wing served from .npz files 
+
+            do_blend_airfoils = []
+            do_blend = Airfoil.do_blend
+            def spy_do_blend (airfoil, *args, **kwargs):
+                do_blend_airfoils.append (airfoil)
+                return do_blend (airfoil, *args, **kwargs)
+            monkeypatch.setattr (Airfoil, 'do_blend', spy_do_blend)
+
+            cache.memory.clear ()
+            misses  = cache.memory.misses 
+
+            wing_2 = Wing (AMOKKA_JX)
+            wing_2.planform.wingSections.do_strak ()
+            blend_airfoils_2 = [sec.airfoil for sec in wing_2.planform.wingSections if sec.airfoil.isBlendAirfoil]
+
+            assert cache.memory.misses == misses + 6                  # not in memory ... 
+            assert len (cache.memory) == 6                            # ... but read from file 
+            assert do_blend_airfoils == []
+            for airfoil, airfoil_2 in zip (blend_airfoils, blend_airfoils_2):
+                assert np.array_equal (airfoil.x, airfoil_2.x) and np.array_equal (airfoil.y, airfoil_2.y)
+
+            # truncated file is a miss - blended again and rewritten  
+
+            with open (npz_files[0], 'r+b') as f:
+                f.truncate (100)
+            cache.memory.clear ()
+
+            wing_3 = Wing (AMOKKA_JX)
+            wing_3.planform.wingSections.do_strak ()
+            blend_airfoils_3 = [sec.airfoil for sec in wing_3.planform.wingSections if sec.airfoil.isBlendAirfoil]
+
+            assert len (do_blend_airfoils) == 1
+            for airfoil, airfoil_3 in zip (blend_airfoils, blend_airfoils_3):
+                assert np.array_equal (airfoil.x, airfoil_3.x) and np.array_equal (airfoil.y, airfoil_3.y)
+            with np.load (npz_files[0]) as data:
+                assert len (data['x']) == len (do_blend_airfoils[0].x)
+        finally:
+            cache.set_directory (directory_before)
+            cache.memory.clear ()
+
+
+    def test_strak_in_pool (self, monkeypatch):
+
+        # parallel strak must be done in the pool and be identical to sequential strak 
+
+        pool_results = []
+        blend_in_pool = WingSections._blend_in_pool
+        def spy_blend_in_pool (sections, jobs, workers):
+            results = blend_in_pool (sections, jobs, workers)
+            pool_results.append (results)
+            return results
+        monkeypatch.setattr (WingSections, '_blend_in_pool', spy_blend_in_pool)
+
+        cache = WingSections.BLEND_CACHE
+        directory_before = cache.directory
+        cache.set_directory (None)
+
+        try:
+            cache.memory.clear ()                                       # no cached blends - all jobs to pool
+            wing_parallel = Wing (TEMPLATE_F3B)
+            wing_parallel.planform.wingSections.do_strak (workers=2)
+
+            cache.memory.clear ()
+            wing_sequential = Wing (TEMPLATE_F3B)
+            wing_sequential.planform.wingSections.do_strak (workers=1)
+        finally:
+            cache.set_directory (directory_before)
+            cache.memory.clear ()
+
+        assert len (pool_results) == 1
+        assert sorted (pool_results[0]) == [0, 1, 2, 3]                 # pool didn't fall back 
+
+        blends_parallel   = [sec.airfoil for sec in wing_parallel.planform.wingSections   if sec.airfoil.isBlendAirfoil]
+        blends_sequential = [sec.airfoil for sec in wing_sequential.planform.wingSections if sec.airfoil.isBlendAirfoil]
+        assert len (blends_parallel) == len (blends_sequential) == 4
+
+        for parallel, sequential in zip (blends_parallel, blends_sequential):
+            assert parallel.name == sequential.name
+            assert np.array_equal (parallel.x, sequential.x) and np.array_equal (parallel.y, sequential.y)
+
+
+# Main program for testing
+if __name__ == "__main__":
+
+    test = Test_Planform()
+    for pathFileName in [TEMPLATE_BOW, TEMPLATE_TRAPEZOID]:
+        for edit in PLANFORM_EDITS:
+            test.test_cache_invalidated(pathFileName, edit)
+
+    test = Test_N_Distrib()
+    test.test_knots_follow_edits()
+
+    test = Test_Planform_Paneled()
+    test.test_wingSections_reduced_fresh_wing()
+
+    test = Test_Wing_Sections()
+    test.test_drag_section()
+
+    test = Test_Flaps()
+    test.test_flaps_follow_section_edits()
+
+    test = Test_Strak()
+    monkeypatch = pytest.MonkeyPatch()
+    test.test_strak_skipped(monkeypatch)
+    test.test_strak_after_set_airfoil(monkeypatch)
+    test.test_strak_after_set_cn(monkeypatch)
+    test.test_blend_cache_directory(monkeypatch, Path(tempfile.mkdtemp()))
+    test.test_strak_in_pool(monkeypatch)
+    monkeypatch.undo()